@@ -8,10 +8,37 @@ This script provides a simple interface to run either the CLI or API server.
 import os
 import sys
 import argparse
-import subprocess
 import asyncio
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Heavy third-party modules imported by the generation pipeline
+PRELOAD_MODULES = ["numpy", "onnxruntime", "openai", "manim"]
+
+
+def _try_import(module_name):
+    """Import a module, ignoring modules that are not installed."""
+    try:
+        importlib.import_module(module_name)
+    except Exception:
+        pass
+
+
+def preload_modules():
+    """
+    Start importing heavy modules in background threads.
+    
+    Much of their import time is spent in C extension initialisation, so the
+    imports overlap with each other and with argument handling. Whoever
+    imports one of them first later simply waits on the module lock.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(PRELOAD_MODULES))
+    for module_name in PRELOAD_MODULES:
+        executor.submit(_try_import, module_name)
+    executor.shutdown(wait=False)
+
+
 def parse_args():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -66,6 +93,21 @@ def parse_args():
         help="Enable auto-reload for the API server (API mode only)"
     )
     
+    parser.add_argument(
+        "--server",
+        type=str,
+        choices=["uvicorn", "granian"],
+        default="uvicorn",
+        help="ASGI server to run the API with (API mode only)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of API worker processes, ignored with --reload (API mode only)"
+    )
+    
     return parser.parse_args()
 
 
@@ -94,43 +136,78 @@ def run_cli(args):
 
 def run_api(args):
     """Run the API server with the provided arguments."""
-    reload_flag = "--reload" if args.reload else ""
-    
-    # Run uvicorn directly
-    cmd = f"uvicorn src.api:app --host {args.host} --port {args.port} {reload_flag}"
-    print(f"Starting API server: {cmd}")
-    
-    try:
-        subprocess.run(cmd, shell=True, check=True)
-    except KeyboardInterrupt:
-        print("API server stopped")
-    except subprocess.CalledProcessError as e:
-        print(f"Error starting API server: {e}")
-        sys.exit(1)
+    # Neither server can combine auto-reload with multiple worker processes
+    workers = 1 if args.reload else args.workers
+    print(f"Starting API server with {args.server} on {args.host}:{args.port} (workers: {workers})")
+    
+    if args.server == "granian":
+        run_granian(args, workers)
+    else:
+        run_uvicorn(args, workers)
+
+
+def run_uvicorn(args, workers):
+    """Serve the API with uvicorn."""
+    import uvicorn
+    
+    # "auto" picks uvloop/httptools when they are installed
+    uvicorn.run(
+        "src.api:app",
+        host=args.host,
+        port=args.port,
+        reload=args.reload,
+        workers=None if args.reload else workers,
+        loop="auto",
+        http="auto"
+    )
+
+
+def run_granian(args, workers):
+    """Serve the API with Granian (Rust/tokio based ASGI server)."""
+    from granian import Granian
+    from granian.constants import Interfaces, Loops
+    
+    Granian(
+        target="src.api:app",
+        address=args.host,
+        port=args.port,
+        interface=Interfaces.ASGI,
+        workers=workers,
+        loop=Loops.auto,
+        backpressure=1024,
+        reload=args.reload
+    ).serve()
 
 
 def check_environment():
     """Check if the environment is properly set up."""
+    # Settings merge the environment with .env, so keys only in .env count as set
+    from src.config.config import config
+    
     # Check for required API keys
     missing_keys = []
     
-    if not os.environ.get("OPENAI_API_KEY"):
-        missing_keys.append("OPENAI_API_KEY")
-        
-    if not os.environ.get("ANTHROPIC_API_KEY"):
-        missing_keys.append("ANTHROPIC_API_KEY")
+    # Every model is reached through OpenRouter
+    if not config.OPEN_ROUTER_API_KEY:
+        missing_keys.append("OPEN_ROUTER_API_KEY")
     
     if missing_keys:
         print(f"Error: Missing required environment variables: {', '.join(missing_keys)}")
-        print("Please set these variables before running the application.")
+        print("Please set these variables in the environment or .env before running the application.")
         sys.exit(1)
     
     # Check for required directories
     output_dir = Path("output")
     output_dir.mkdir(exist_ok=True)
     
-    models_dir = Path("models")
-    if not models_dir.exists() or not any(models_dir.iterdir()):
+    # Stop at the first directory entry instead of listing the whole directory
+    try:
+        with os.scandir("models") as entries:
+            models_empty = next(entries, None) is None
+    except FileNotFoundError:
+        models_empty = True
+    
+    if models_empty:
         print("Warning: Models directory is empty or does not exist.")
         print("Make sure to download the Kokoro TTS model files (kokoro-v0_19.onnx and voices.bin) to the models/ directory.")
 
@@ -140,6 +217,10 @@ def main():
     # Parse arguments
     args = parse_args()
     
+    # API workers import the app in their own processes, so only warm up the CLI
+    if args.mode == "cli":
+        preload_modules()
+    
     # Check environment
     check_environment()
     
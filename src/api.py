@@ -9,15 +9,17 @@ import uuid
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
+import httpx
 from fastapi import FastAPI, BackgroundTasks, HTTPException, Depends, status, Query
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 from src.core.pipeline import generate_math_video
 from src.core.input_processor import MathQuery
-from src.config.config import Config
+from src.config.config import config
 from src.utils.logging_utils import get_logger
+from src.utils.job_store import get_job_store
 
 logger = get_logger(__name__)
 
@@ -36,8 +38,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Track active jobs
-active_jobs = {}
+# Track active jobs (shared across workers when REDIS_URL is set)
+job_store = get_job_store()
+
+
+@app.on_event("startup")
+async def create_http_client():
+    """Create the HTTP client shared by all jobs' AI requests."""
+    app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        timeout=httpx.Timeout(600.0, connect=10.0)
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Close the shared HTTP client."""
+    await app.state.http_client.aclose()
 
 
 class VideoRequest(BaseModel):
@@ -60,35 +78,27 @@ class JobStatus(BaseModel):
     metrics: Optional[Dict[str, Any]] = None
 
 
-def get_api_keys():
-    """Get API keys from environment variables."""
-    openai_key = os.environ.get("OPENAI_API_KEY")
-    anthropic_key = os.environ.get("ANTHROPIC_API_KEY")
-    
-    if not openai_key:
-        logger.error("OPENAI_API_KEY environment variable is not set")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="OpenAI API key not configured on server"
-        )
-        
-    if not anthropic_key:
-        logger.error("ANTHROPIC_API_KEY environment variable is not set")
+def require_api_key():
+    """Check that the OpenRouter API key used for all model calls is configured."""
+    if not config.OPEN_ROUTER_API_KEY:
+        logger.error("OPEN_ROUTER_API_KEY environment variable is not set")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Anthropic API key not configured on server"
+            detail="OpenRouter API key not configured on server"
         )
-        
-    return {"openai_key": openai_key, "anthropic_key": anthropic_key}
 
 
-async def generate_video_task(job_id: str, request: VideoRequest, api_keys: Dict[str, str]):
+async def generate_video_task(job_id: str, request: VideoRequest,
+                              http_client: Optional[httpx.AsyncClient] = None):
     """Background task for video generation."""
     try:
         # Update job status
-        active_jobs[job_id]["status"] = "processing"
-        active_jobs[job_id]["progress"] = 0.0
-        active_jobs[job_id]["message"] = "Starting video generation"
+        await job_store.update(
+            job_id,
+            status="processing",
+            progress=0.0,
+            message="Starting video generation"
+        )
         
         # Convert request to kwargs
         kwargs = request.dict(exclude_unset=True)
@@ -97,17 +107,19 @@ async def generate_video_task(job_id: str, request: VideoRequest, api_keys: Dict
         # Generate the video
         video_path, metrics = await generate_math_video(
             query=query,
-            openai_api_key=api_keys["openai_key"],
-            anthropic_api_key=api_keys["anthropic_key"],
+            http_client=http_client,
             **kwargs
         )
         
         # Update job status
-        active_jobs[job_id]["status"] = "completed"
-        active_jobs[job_id]["progress"] = 100.0
-        active_jobs[job_id]["message"] = "Video generation completed"
-        active_jobs[job_id]["video_path"] = video_path
-        active_jobs[job_id]["metrics"] = metrics
+        await job_store.update(
+            job_id,
+            status="completed",
+            progress=100.0,
+            message="Video generation completed",
+            video_path=video_path,
+            metrics=metrics
+        )
         
         logger.info(f"Job {job_id} completed successfully")
         
@@ -115,16 +127,19 @@ async def generate_video_task(job_id: str, request: VideoRequest, api_keys: Dict
         logger.error(f"Error in job {job_id}: {str(e)}")
         
         # Update job status
-        active_jobs[job_id]["status"] = "failed"
-        active_jobs[job_id]["message"] = "Video generation failed"
-        active_jobs[job_id]["error"] = str(e)
+        await job_store.update(
+            job_id,
+            status="failed",
+            message="Video generation failed",
+            error=str(e)
+        )
 
 
-@app.post("/generate", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED)
+@app.post("/generate", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED,
+          dependencies=[Depends(require_api_key)])
 async def create_video(
     request: VideoRequest,
-    background_tasks: BackgroundTasks,
-    api_keys: Dict[str, str] = Depends(get_api_keys)
+    background_tasks: BackgroundTasks
 ):
     """
     Start a video generation job.
@@ -135,7 +150,7 @@ async def create_video(
     job_id = str(uuid.uuid4())
     
     # Initialize job status
-    active_jobs[job_id] = {
+    job = {
         "job_id": job_id,
         "status": "queued",
         "progress": 0.0,
@@ -144,13 +159,16 @@ async def create_video(
         "error": None,
         "metrics": None
     }
+    await job_store.create(job_id, job)
     
     # Start the video generation in the background
-    background_tasks.add_task(generate_video_task, job_id, request, api_keys)
+    background_tasks.add_task(
+        generate_video_task, job_id, request, app.state.http_client
+    )
     
     logger.info(f"Job {job_id} queued for query: {request.query}")
     
-    return JobStatus(**active_jobs[job_id])
+    return JobStatus(**job)
 
 
 @app.get("/status/{job_id}", response_model=JobStatus)
@@ -158,13 +176,49 @@ async def get_job_status(job_id: str):
     """
     Get the status of a video generation job.
     """
-    if job_id not in active_jobs:
+    job = await job_store.get(job_id)
+    
+    if job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job {job_id} not found"
         )
         
-    return JobStatus(**active_jobs[job_id])
+    return JobStatus(**job)
+
+
+@app.get("/events/{job_id}")
+async def stream_job_events(job_id: str):
+    """
+    Stream status updates for a video generation job as Server-Sent Events.
+    
+    Each event carries the same payload as /status and is only sent when the
+    job changes; the stream closes once the job completes or fails.
+    """
+    if await job_store.get(job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    
+    async def event_stream():
+        async for job in job_store.watch(job_id):
+            yield f"data: {JobStatus(**job).model_dump_json()}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/jobs", response_model=List[JobStatus])
+async def list_jobs():
+    """
+    List all known video generation jobs.
+    """
+    jobs = await job_store.list_jobs()
+    return [JobStatus(**job) for job in jobs]
 
 
 @app.get("/video/{job_id}")
@@ -172,13 +226,13 @@ async def get_video(job_id: str):
     """
     Get the generated video for a completed job.
     """
-    if job_id not in active_jobs:
+    job = await job_store.get(job_id)
+    
+    if job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job {job_id} not found"
         )
-        
-    job = active_jobs[job_id]
     
     if job["status"] != "completed":
         raise HTTPException(
@@ -186,16 +240,25 @@ async def get_video(job_id: str):
             detail=f"Job {job_id} is not completed yet. Current status: {job['status']}"
         )
         
-    if not job["video_path"] or not os.path.exists(job["video_path"]):
+    try:
+        stat_result = os.stat(job["video_path"]) if job["video_path"] else None
+    except FileNotFoundError:
+        stat_result = None
+        
+    if stat_result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Video file not found for job {job_id}"
         )
-        
+    
+    # Reusing the stat result lets Starlette set ETag/Last-Modified and serve
+    # Range requests without statting the file again; finished videos never change.
     return FileResponse(
         path=job["video_path"],
         media_type="video/mp4",
-        filename=os.path.basename(job["video_path"])
+        filename=os.path.basename(job["video_path"]),
+        stat_result=stat_result,
+        headers={"Cache-Control": "public, max-age=86400"}
     )
 
 
@@ -204,13 +267,13 @@ async def get_metrics(job_id: str):
     """
     Get the performance metrics for a completed job.
     """
-    if job_id not in active_jobs:
+    job = await job_store.get(job_id)
+    
+    if job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job {job_id} not found"
         )
-        
-    job = active_jobs[job_id]
     
     if job["status"] != "completed":
         raise HTTPException(
@@ -3,7 +3,6 @@
 Command-line interface for the Manim Video Generator.
 """
 
-import os
 import sys
 import asyncio
 import argparse
@@ -12,8 +11,9 @@ from typing import Dict, Any, Optional
 from pathlib import Path
 
 from src.core.pipeline import generate_math_video
-from src.config.config import Config
+from src.config.config import config
 from src.utils.logging_utils import get_logger
+from src.utils.video_utils import use_pidfd_child_watcher
 
 logger = get_logger(__name__)
 
@@ -61,22 +61,8 @@ def parse_args():
     parser.add_argument(
         "--output-dir",
         type=str,
-        default=Config.OUTPUT_DIR,
-        help=f"Output directory (default: {Config.OUTPUT_DIR})"
-    )
-    
-    parser.add_argument(
-        "--openai-key",
-        type=str,
-        default=os.environ.get("OPENAI_API_KEY"),
-        help="OpenAI API key (default: from OPENAI_API_KEY env var)"
-    )
-    
-    parser.add_argument(
-        "--anthropic-key",
-        type=str,
-        default=os.environ.get("ANTHROPIC_API_KEY"),
-        help="Anthropic API key (default: from ANTHROPIC_API_KEY env var)"
+        default=config.OUTPUT_DIR,
+        help=f"Output directory (default: {config.OUTPUT_DIR})"
     )
     
     parser.add_argument(
@@ -92,15 +78,6 @@ async def main():
     """Main entry point for the CLI."""
     args = parse_args()
     
-    # Validate API keys
-    if not args.openai_key:
-        logger.error("OpenAI API key is required. Set OPENAI_API_KEY environment variable or use --openai-key.")
-        sys.exit(1)
-        
-    if not args.anthropic_key:
-        logger.error("Anthropic API key is required. Set ANTHROPIC_API_KEY environment variable or use --anthropic-key.")
-        sys.exit(1)
-    
     # Prepare arguments for the video generator
     kwargs = {}
     
@@ -122,8 +99,6 @@ async def main():
         
         video_path, metrics = await generate_math_video(
             query=args.query,
-            openai_api_key=args.openai_key,
-            anthropic_api_key=args.anthropic_key,
             **kwargs
         )
         
@@ -142,10 +117,13 @@ async def main():
         logger.info(f"Total generation time: {total_time:.2f} seconds")
         
         if "stage_durations" in metrics and "stage_times" in metrics["stage_durations"]:
-            logger.info("Time breakdown by stage:")
-            for stage, duration in metrics["stage_durations"]["stage_times"].items():
-                percentage = duration / total_time * 100
-                logger.info(f"  - {stage}: {duration:.2f}s ({percentage:.1f}%)")
+            # Emit the breakdown as a single log record
+            stage_times = metrics["stage_durations"]["stage_times"]
+            breakdown = "\n".join(
+                f"  - {stage}: {duration:.2f}s ({duration / total_time * 100:.1f}%)"
+                for stage, duration in stage_times.items()
+            )
+            logger.info(f"Time breakdown by stage:\n{breakdown}")
         
     except Exception as e:
         logger.error(f"Error generating video: {str(e)}")
@@ -153,4 +131,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    use_pidfd_child_watcher()
     asyncio.run(main()) 
\ No newline at end of file
@@ -1,22 +1,52 @@
 import os
-from dotenv import load_dotenv
+from typing import Optional
 
-# Load environment variables from .env file
-load_dotenv()
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-class Config:
-    OUTPUT_DIR = "output"
-    CONTEXT_LEARNING_PATH = "data/context_learning"
-    MANIM_DOCS_PATH = "data/rag/manim_docs"
-    EMBEDDING_MODEL = "azure/text-embedding-3-large"
-    OPEN_ROUTER_API_KEY = os.getenv('OPEN_ROUTER_API_KEY')
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-    ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+
+class Config(BaseSettings):
+    """
+    Application settings, read once from the environment and the .env file.
+    
+    The settings object is frozen so the shared instance can be used from any
+    thread or task without locking.
+    """
+    model_config = SettingsConfigDict(env_file=".env", frozen=True, extra="ignore")
+    
+    OUTPUT_DIR: str = "output"
+    CONTEXT_LEARNING_PATH: str = "data/context_learning"
+    MANIM_DOCS_PATH: str = "data/rag/manim_docs"
+    EMBEDDING_MODEL: str = "azure/text-embedding-3-large"
+    OPEN_ROUTER_API_KEY: Optional[str] = None
+    OPENAI_API_KEY: Optional[str] = None
+    ANTHROPIC_API_KEY: Optional[str] = None
+    GEMINI_API_KEY: Optional[str] = None
+    MAX_CONCURRENT_LLM: int = 4
     
     # Kokoro TTS configurations
-    KOKORO_MODEL_PATH = os.getenv('KOKORO_MODEL_PATH')
-    KOKORO_VOICES_PATH = os.getenv('KOKORO_VOICES_PATH')
-    KOKORO_DEFAULT_VOICE = os.getenv('KOKORO_DEFAULT_VOICE')
-    KOKORO_DEFAULT_SPEED = float(os.getenv('KOKORO_DEFAULT_SPEED', '1.0'))
-    KOKORO_DEFAULT_LANG = os.getenv('KOKORO_DEFAULT_LANG') 
\ No newline at end of file
+    KOKORO_MODEL_PATH: Optional[str] = None
+    KOKORO_VOICES_PATH: Optional[str] = None
+    KOKORO_DEFAULT_VOICE: Optional[str] = None
+    KOKORO_DEFAULT_SPEED: float = 1.0
+    KOKORO_DEFAULT_LANG: Optional[str] = None
+    TTS_CACHE_DIR: str = "~/.cache/manim-video-agent/tts"
+    
+    # Manim rendering configurations
+    MANIM_FRAME_RATE: int = 30
+    MANIM_MEDIA_DIR: str = "~/.cache/manim-video-agent/manim"
+    MANIM_PERSISTENT_WORKERS: bool = False
+    RENDER_CACHE_DIR: str = "~/.cache/manim-video-agent/renders"
+    RENDER_CACHE_MAX_BYTES: int = 2 * 1024 ** 3
+    
+    # Media processing concurrency limits
+    MAX_PARALLEL_RENDERS: int = max(1, (os.cpu_count() or 2) // 2)
+    MAX_PARALLEL_FFMPEG: int = os.cpu_count() or 1
+    MAX_PARALLEL_TTS: int = 1
+    
+    # API job store configurations
+    REDIS_URL: Optional[str] = None
+    JOB_TTL_SECONDS: int = 3600
+
+
+# Shared settings instance
+config = Config()
@@ -11,7 +11,7 @@ import asyncio
 import hashlib
 import os
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union, Tuple
+from typing import Dict, Any, List, Optional, Union
 import logging
 from pydantic import BaseModel, Field
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -19,6 +19,7 @@ import re
 import time
 import random
 
+import httpx
 from openai import OpenAI, AsyncOpenAI
 # These imports will be used for model name references only
 # We're keeping them to maintain compatibility with the existing code
@@ -135,13 +136,16 @@ class AIManager:
     Manages interactions with various AI models for different stages of the video generation process.
     """
     
-    def __init__(self, config: Config, use_cache: bool = True):
+    def __init__(self, config: Config, use_cache: bool = True,
+                 http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the AI manager.
         
         Args:
             config: Configuration object
             use_cache: Whether to use response caching
+            http_client: Optional shared HTTP client for async requests, so
+                connections are pooled across AI managers
         """
         self.config = config
         self.use_cache = use_cache
@@ -155,7 +159,8 @@ class AIManager:
         # Initialize AsyncOpenAI as well for async requests
         self.async_openai_client = AsyncOpenAI(
             base_url="https://openrouter.ai/api/v1",
-            api_key=config.OPEN_ROUTER_API_KEY
+            api_key=config.OPEN_ROUTER_API_KEY,
+            http_client=http_client
         )
         
         # Set up OpenRouter headers
@@ -180,6 +185,9 @@ class AIManager:
         # Initialize animation planner
         self.animation_planner = AnimationPlanner()
         
+        # Bound in-flight LLM requests when scenes are processed concurrently
+        self.llm_semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_LLM)
+        
         logger.info("AI Manager initialized with OpenRouter")
         
         # Model usage tracking
@@ -428,7 +436,7 @@ Create a natural, engaging narration script for an educational video explaining:
 QUERY: {query_text}
 
 The script should align with this animation plan:
-{json.dumps(animation_plan.dict(), indent=2)}
+{animation_plan.model_dump_json(indent=2)}
 
 For each section, write precise narration text that:
 1. Clearly explains the concepts
@@ -512,7 +520,7 @@ Generate complete, executable Manim code for a video that explains:
 QUERY: {query_text}
 
 Following this animation plan:
-{json.dumps(animation_plan.dict(), indent=2)}
+{animation_plan.model_dump_json(indent=2)}
 
 With these narration scripts for each section:
 {json.dumps(scripts, indent=2)}
@@ -577,32 +585,6 @@ Focus on correctness and precise timing for audio-visual synchronization."""
             logger.error(f"Error generating Manim code: {e}")
             return None
     
-    async def generate_content_concurrently(self, query: Union[str, Dict[str, Any]], explanation: str, animation_plan: AnimationPlan) -> Tuple[Dict[str, str], str]:
-        """
-        Generate the script and Manim code concurrently for maximum performance.
-        
-        Args:
-            query: Either a string containing the query or a dictionary containing the query and related information
-            explanation: Mathematical explanation
-            animation_plan: Structured animation plan
-            
-        Returns:
-            Tuple of (scripts, manim_code)
-        """
-        logger.info("Starting concurrent content generation")
-        
-        # Start both tasks concurrently
-        script_task = asyncio.create_task(self.generate_script(animation_plan, explanation, query))
-        
-        # We need to wait for the script before generating Manim code
-        scripts = await script_task
-        
-        # Generate Manim code with the scripts
-        manim_code = await self.generate_manim_code(animation_plan, scripts, query)
-        
-        logger.info("Concurrent content generation completed")
-        return scripts, manim_code
-    
     def get_model_usage(self) -> Dict[str, Dict[str, int]]:
         """
         Get the current model usage statistics.
@@ -981,11 +963,12 @@ Be as specific and detailed as possible so a programmer can implement this scene
         
         # Step 1: Generate script and animation plan for the scene
         try:
-            scene_content = await self.generate_scene_script_and_animation(
-                scene_data=scene_data,
-                query=query,
-                explanation=explanation
-            )
+            async with self.llm_semaphore:
+                scene_content = await self.generate_scene_script_and_animation(
+                    scene_data=scene_data,
+                    query=query,
+                    explanation=explanation
+                )
             
             if not scene_content:
                 logger.error(f"Failed to generate content for scene {scene_id}")
@@ -1019,12 +1002,13 @@ Be as specific and detailed as possible so a programmer can implement this scene
             )
             
             # Step 2: Generate Manim code for the scene
-            scene_code = await self.generate_scene_code(
-                scene_id=scene_id,
-                scene_title=scene_title,
-                narration=narration,
-                animation_plan=animation_plan
-            )
+            async with self.llm_semaphore:
+                scene_code = await self.generate_scene_code(
+                    scene_id=scene_id,
+                    scene_title=scene_title,
+                    narration=narration,
+                    animation_plan=animation_plan
+                )
             
             if not scene_code:
                 logger.error(f"Failed to generate Manim code for scene {scene_id}")
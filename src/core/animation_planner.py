@@ -5,10 +5,13 @@ This module provides advanced planning capabilities for mathematical animations,
 including scene breakdown, timing estimation, and templates for common visualizations.
 """
 
-import json
-from typing import Dict, Any, List, Optional, Tuple
-from pydantic import BaseModel, Field, validator
+import re
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 import math
+import numpy as np
 
 from src.utils.logging_utils import get_logger
 
@@ -22,6 +25,12 @@ class VisualElement(BaseModel):
     animation: str = Field(..., description="Type of animation to use (FadeIn, Transform, etc.)")
     duration: float = Field(..., description="Duration in seconds")
     sync_with_narration: Optional[str] = Field(None, description="Text that should be spoken during this element")
+    
+    @field_validator('type', 'animation')
+    @classmethod
+    def intern_vocabulary(cls, v: str) -> str:
+        """Intern the small, repetitive type/animation vocabulary to share one string per value."""
+        return sys.intern(v)
 
 
 class Scene(BaseModel):
@@ -45,18 +54,6 @@ class Section(BaseModel):
     duration: float = Field(..., description="Duration in seconds")
     narration_summary: str = Field(..., description="Summary of what will be explained in this section")
     visual_elements: List[VisualElement] = Field(..., description="Visual elements in this section")
-    
-    @validator('duration')
-    def validate_duration(cls, v, values):
-        """Validate that the section duration matches the sum of visual elements."""
-        if 'visual_elements' in values and values['visual_elements']:
-            total_element_duration = sum(element.duration for element in values['visual_elements'])
-            # Allow for small differences due to floating point precision
-            if abs(v - total_element_duration) > 0.5:
-                logger.warning(f"Section '{values.get('id', 'unknown')}' duration ({v}s) doesn't match sum of visual elements ({total_element_duration}s)")
-                # Adjust the section duration to match the sum of visual elements
-                return total_element_duration
-        return v
 
 
 class VisualStyle(BaseModel):
@@ -74,18 +71,14 @@ class AnimationPlan(BaseModel):
     scenes: Optional[List[Scene]] = Field(None, description="List of scenes in the animation")
     estimated_duration: float = Field(..., description="Estimated duration in seconds")
     visual_style: VisualStyle = Field(..., description="Visual style guidelines")
-    
-    @validator('estimated_duration')
-    def validate_estimated_duration(cls, v, values):
-        """Validate that the estimated duration matches the sum of section durations."""
-        if 'sections' in values and values['sections']:
-            total_section_duration = sum(section.duration for section in values['sections'])
-            # Allow for small differences due to floating point precision
-            if abs(v - total_section_duration) > 1.0:
-                logger.warning(f"Estimated duration ({v}s) doesn't match sum of sections ({total_section_duration}s)")
-                # Adjust the estimated duration to match the sum of sections
-                return total_section_duration
-        return v
+
+
+# Validates a whole list of generated sections in one call
+_SECTIONS_ADAPTER = TypeAdapter(List[Section])
+
+
+# Paragraph breaks: a blank line, possibly containing other whitespace
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
 
 
 class SceneBreakdownAlgorithm:
@@ -105,8 +98,8 @@ class SceneBreakdownAlgorithm:
         Returns:
             List of section dictionaries with id, title, and content
         """
-        # Split the explanation into paragraphs
-        paragraphs = [p.strip() for p in explanation.split('\n\n') if p.strip()]
+        # Split the explanation into paragraphs, stripping each one once
+        paragraphs = [p for p in map(str.strip, _PARAGRAPH_BREAK_RE.split(explanation)) if p]
         
         # If there are too few paragraphs, treat each as a section
         if len(paragraphs) <= max_sections:
@@ -119,23 +112,60 @@ class SceneBreakdownAlgorithm:
                 for i, paragraph in enumerate(paragraphs)
             ]
         
-        # If there are too many paragraphs, group them into sections
-        sections = []
+        # If there are too many paragraphs, group them into sections of
+        # consecutive paragraphs with word counts as even as possible
         paragraphs_per_section = math.ceil(len(paragraphs) / max_sections)
+        num_sections = math.ceil(len(paragraphs) / paragraphs_per_section)
+        word_counts = [len(paragraph.split()) for paragraph in paragraphs]
+        boundaries = _balanced_partition(word_counts, num_sections)
         
-        for i in range(0, len(paragraphs), paragraphs_per_section):
-            section_paragraphs = paragraphs[i:i+paragraphs_per_section]
-            section_content = '\n\n'.join(section_paragraphs)
-            section_id = f"section{len(sections)+1}"
-            section_title = _extract_title(section_paragraphs[0], len(sections))
-            
-            sections.append({
-                "id": section_id,
-                "title": section_title,
-                "content": section_content
-            })
+        return [
+            {
+                "id": f"section{k+1}",
+                "title": _extract_title(paragraphs[start], k),
+                "content": '\n\n'.join(paragraphs[start:end])
+            }
+            for k, (start, end) in enumerate(zip(boundaries, boundaries[1:]))
+        ]
+
+
+def _balanced_partition(weights: List[int], num_groups: int) -> List[int]:
+    """
+    Split a sequence into consecutive groups with balanced total weight.
+    
+    Uses dynamic programming over prefix sums to minimise the sum of squared
+    deviations of each group's weight from the mean group weight.
+    
+    Args:
+        weights: Weight of each item (e.g. paragraph word counts)
+        num_groups: Number of non-empty groups to create (at most len(weights))
         
-        return sections
+    Returns:
+        Group boundaries as indices, starting with 0 and ending with len(weights)
+    """
+    n = len(weights)
+    prefix = [0]
+    for weight in weights:
+        prefix.append(prefix[-1] + weight)
+    target = prefix[n] / num_groups
+    
+    # cost[k][j]: best cost of splitting the first j items into k groups
+    cost = [[math.inf] * (n + 1) for _ in range(num_groups + 1)]
+    split = [[0] * (n + 1) for _ in range(num_groups + 1)]
+    cost[0][0] = 0.0
+    for k in range(1, num_groups + 1):
+        for j in range(k, n - (num_groups - k) + 1):
+            for i in range(k - 1, j):
+                candidate = cost[k - 1][i] + (prefix[j] - prefix[i] - target) ** 2
+                if candidate < cost[k][j]:
+                    cost[k][j] = candidate
+                    split[k][j] = i
+    
+    # Walk the split points back from the full sequence
+    boundaries = [n]
+    for k in range(num_groups, 0, -1):
+        boundaries.append(split[k][boundaries[-1]])
+    return boundaries[::-1]
 
 
 def _extract_title(text: str, fallback_index: int) -> str:
@@ -150,14 +180,16 @@ def _extract_title(text: str, fallback_index: int) -> str:
         A suitable title
     """
     # Try to get the first sentence
-    if '.' in text[:100]:
-        first_sentence = text.split('.')[0].strip()
+    dot = text.find('.', 0, 100)
+    if dot != -1:
+        first_sentence = text[:dot].strip()
         if 10 <= len(first_sentence) <= 50:
             return first_sentence
     
     # Try to get the first line
-    if '\n' in text[:100]:
-        first_line = text.split('\n')[0].strip()
+    newline = text.find('\n', 0, 100)
+    if newline != -1:
+        first_line = text[:newline].strip()
         if 10 <= len(first_line) <= 50:
             return first_line
     
@@ -173,8 +205,8 @@ class TimingEstimator:
     # Average reading speed in words per minute
     READING_SPEED = 150
     
-    # Base durations for different animation types in seconds
-    ANIMATION_DURATIONS = {
+    # Base durations for different animation types in seconds (read-only)
+    ANIMATION_DURATIONS = MappingProxyType({
         "FadeIn": 1.0,
         "FadeOut": 1.0,
         "Write": 2.0,
@@ -189,7 +221,8 @@ class TimingEstimator:
         "ShowCreationThenDestruction": 2.0,
         "ApplyMethod": 1.0,
         "default": 1.5
-    }
+    })
+    DEFAULT_ANIMATION_DURATION = ANIMATION_DURATIONS["default"]
     
     @classmethod
     def estimate_narration_duration(cls, text: str) -> float:
@@ -214,6 +247,25 @@ class TimingEstimator:
         
         return duration_seconds + buffer_seconds
     
+    @classmethod
+    def estimate_narration_durations(cls, texts: List[str]) -> np.ndarray:
+        """
+        Estimate the durations of several narrations at once.
+        
+        Equivalent to calling estimate_narration_duration on each text, with
+        the arithmetic done as one array expression.
+        
+        Args:
+            texts: The narration texts
+            
+        Returns:
+            Array of estimated durations in seconds, in the same order
+        """
+        word_counts = np.fromiter((len(text.split()) for text in texts), dtype=np.float64, count=len(texts))
+        
+        # Reading time plus 1 second of pauses for every 50 words
+        return word_counts / cls.READING_SPEED * 60 + word_counts / 50
+    
     @classmethod
     def estimate_animation_duration(cls, animation_type: str, content: str) -> float:
         """
@@ -227,30 +279,32 @@ class TimingEstimator:
             Estimated duration in seconds
         """
         # Get base duration for the animation type
-        base_duration = cls.ANIMATION_DURATIONS.get(animation_type, cls.ANIMATION_DURATIONS["default"])
+        base_duration = cls.ANIMATION_DURATIONS.get(animation_type, cls.DEFAULT_ANIMATION_DURATION)
         
         # Adjust based on content length
-        content_factor = 1.0
-        if len(content) > 100:
-            content_factor = 1.5
-        elif len(content) > 50:
-            content_factor = 1.2
-        
-        return base_duration * content_factor
+        content_length = len(content)
+        if content_length > 100:
+            return base_duration * 1.5
+        if content_length > 50:
+            return base_duration * 1.2
+        return base_duration
     
     @classmethod
-    def estimate_section_duration(cls, narration: str, visual_elements: List[Dict[str, Any]]) -> float:
+    def estimate_section_duration(cls, narration: str, visual_elements: List[Dict[str, Any]],
+                                  narration_duration: Optional[float] = None) -> float:
         """
         Estimate the total duration of a section based on narration and visual elements.
         
         Args:
             narration: The narration text for the section
             visual_elements: List of visual elements in the section
+            narration_duration: Precomputed narration duration, if already estimated
             
         Returns:
             Estimated duration in seconds
         """
-        narration_duration = cls.estimate_narration_duration(narration)
+        if narration_duration is None:
+            narration_duration = cls.estimate_narration_duration(narration)
         
         # Sum up the durations of visual elements
         animation_duration = sum(
@@ -263,13 +317,176 @@ class TimingEstimator:
         return max(narration_duration, animation_duration) + 2.0
 
 
+def _freeze_template(elements: List[Dict[str, Any]]) -> Tuple[Mapping[str, Any], ...]:
+    """Turn a template's visual elements into a read-only structure."""
+    return tuple(MappingProxyType(element) for element in elements)
+
+
 class VisualizationTemplates:
     """
     Templates for common mathematical visualizations.
+    
+    Templates are built once at import and shared read-only; the plan models
+    copy the elements into their own objects during validation.
     """
     
-    @staticmethod
-    def get_template(concept_type: str) -> List[Dict[str, Any]]:
+    TEMPLATES = MappingProxyType({
+        "theorem": _freeze_template([
+            {
+                "type": "text",
+                "content": "Theorem Statement",
+                "animation": "Write",
+                "duration": 2.0
+            },
+            {
+                "type": "text",
+                "content": "Key Insight",
+                "animation": "FadeIn",
+                "duration": 1.5
+            },
+            {
+                "type": "equation",
+                "content": "Mathematical Formulation",
+                "animation": "Write",
+                "duration": 2.5
+            },
+            {
+                "type": "graph",
+                "content": "Visual Representation",
+                "animation": "Create",
+                "duration": 3.0
+            },
+            {
+                "type": "text",
+                "content": "Implications",
+                "animation": "FadeIn",
+                "duration": 1.5
+            }
+        ]),
+        "proof": _freeze_template([
+            {
+                "type": "text",
+                "content": "Theorem to Prove",
+                "animation": "Write",
+                "duration": 2.0
+            },
+            {
+                "type": "text",
+                "content": "Proof Strategy",
+                "animation": "FadeIn",
+                "duration": 1.5
+            },
+            {
+                "type": "equation",
+                "content": "Starting Point",
+                "animation": "Write",
+                "duration": 2.0
+            },
+            {
+                "type": "equation",
+                "content": "Step 1",
+                "animation": "Transform",
+                "duration": 2.0
+            },
+            {
+                "type": "equation",
+                "content": "Step 2",
+                "animation": "Transform",
+                "duration": 2.0
+            },
+            {
+                "type": "equation",
+                "content": "Final Result",
+                "animation": "Transform",
+                "duration": 2.0
+            },
+            {
+                "type": "text",
+                "content": "QED",
+                "animation": "FadeIn",
+                "duration": 1.0
+            }
+        ]),
+        "concept": _freeze_template([
+            {
+                "type": "text",
+                "content": "Concept Introduction",
+                "animation": "Write",
+                "duration": 2.0
+            },
+            {
+                "type": "text",
+                "content": "Intuitive Explanation",
+                "animation": "FadeIn",
+                "duration": 2.0
+            },
+            {
+                "type": "graph",
+                "content": "Visual Representation",
+                "animation": "Create",
+                "duration": 3.0
+            },
+            {
+                "type": "equation",
+                "content": "Formal Definition",
+                "animation": "Write",
+                "duration": 2.5
+            },
+            {
+                "type": "text",
+                "content": "Examples",
+                "animation": "FadeIn",
+                "duration": 2.0
+            },
+            {
+                "type": "text",
+                "content": "Applications",
+                "animation": "FadeIn",
+                "duration": 1.5
+            }
+        ]),
+        "problem": _freeze_template([
+            {
+                "type": "text",
+                "content": "Problem Statement",
+                "animation": "Write",
+                "duration": 2.0
+            },
+            {
+                "type": "text",
+                "content": "Key Insight",
+                "animation": "FadeIn",
+                "duration": 1.5
+            },
+            {
+                "type": "equation",
+                "content": "Step 1",
+                "animation": "Write",
+                "duration": 2.0
+            },
+            {
+                "type": "equation",
+                "content": "Step 2",
+                "animation": "Transform",
+                "duration": 2.0
+            },
+            {
+                "type": "equation",
+                "content": "Step 3",
+                "animation": "Transform",
+                "duration": 2.0
+            },
+            {
+                "type": "equation",
+                "content": "Final Answer",
+                "animation": "Transform",
+                "duration": 2.0
+            }
+        ])
+    })
+    
+    @classmethod
+    def get_template(cls, concept_type: str) -> Tuple[Mapping[str, Any], ...]:
         """
         Get a template for a specific mathematical concept.
         
@@ -277,164 +494,9 @@ class VisualizationTemplates:
             concept_type: Type of mathematical concept
             
         Returns:
-            List of visual elements for the template
+            Read-only visual elements for the template
         """
-        templates = {
-            "theorem": [
-                {
-                    "type": "text",
-                    "content": "Theorem Statement",
-                    "animation": "Write",
-                    "duration": 2.0
-                },
-                {
-                    "type": "text",
-                    "content": "Key Insight",
-                    "animation": "FadeIn",
-                    "duration": 1.5
-                },
-                {
-                    "type": "equation",
-                    "content": "Mathematical Formulation",
-                    "animation": "Write",
-                    "duration": 2.5
-                },
-                {
-                    "type": "graph",
-                    "content": "Visual Representation",
-                    "animation": "Create",
-                    "duration": 3.0
-                },
-                {
-                    "type": "text",
-                    "content": "Implications",
-                    "animation": "FadeIn",
-                    "duration": 1.5
-                }
-            ],
-            "proof": [
-                {
-                    "type": "text",
-                    "content": "Theorem to Prove",
-                    "animation": "Write",
-                    "duration": 2.0
-                },
-                {
-                    "type": "text",
-                    "content": "Proof Strategy",
-                    "animation": "FadeIn",
-                    "duration": 1.5
-                },
-                {
-                    "type": "equation",
-                    "content": "Starting Point",
-                    "animation": "Write",
-                    "duration": 2.0
-                },
-                {
-                    "type": "equation",
-                    "content": "Step 1",
-                    "animation": "Transform",
-                    "duration": 2.0
-                },
-                {
-                    "type": "equation",
-                    "content": "Step 2",
-                    "animation": "Transform",
-                    "duration": 2.0
-                },
-                {
-                    "type": "equation",
-                    "content": "Final Result",
-                    "animation": "Transform",
-                    "duration": 2.0
-                },
-                {
-                    "type": "text",
-                    "content": "QED",
-                    "animation": "FadeIn",
-                    "duration": 1.0
-                }
-            ],
-            "concept": [
-                {
-                    "type": "text",
-                    "content": "Concept Introduction",
-                    "animation": "Write",
-                    "duration": 2.0
-                },
-                {
-                    "type": "text",
-                    "content": "Intuitive Explanation",
-                    "animation": "FadeIn",
-                    "duration": 2.0
-                },
-                {
-                    "type": "graph",
-                    "content": "Visual Representation",
-                    "animation": "Create",
-                    "duration": 3.0
-                },
-                {
-                    "type": "equation",
-                    "content": "Formal Definition",
-                    "animation": "Write",
-                    "duration": 2.5
-                },
-                {
-                    "type": "text",
-                    "content": "Examples",
-                    "animation": "FadeIn",
-                    "duration": 2.0
-                },
-                {
-                    "type": "text",
-                    "content": "Applications",
-                    "animation": "FadeIn",
-                    "duration": 1.5
-                }
-            ],
-            "problem": [
-                {
-                    "type": "text",
-                    "content": "Problem Statement",
-                    "animation": "Write",
-                    "duration": 2.0
-                },
-                {
-                    "type": "text",
-                    "content": "Key Insight",
-                    "animation": "FadeIn",
-                    "duration": 1.5
-                },
-                {
-                    "type": "equation",
-                    "content": "Step 1",
-                    "animation": "Write",
-                    "duration": 2.0
-                },
-                {
-                    "type": "equation",
-                    "content": "Step 2",
-                    "animation": "Transform",
-                    "duration": 2.0
-                },
-                {
-                    "type": "equation",
-                    "content": "Step 3",
-                    "animation": "Transform",
-                    "duration": 2.0
-                },
-                {
-                    "type": "equation",
-                    "content": "Final Answer",
-                    "animation": "Transform",
-                    "duration": 2.0
-                }
-            ]
-        }
-        
-        return templates.get(concept_type, templates["concept"])
+        return cls.TEMPLATES.get(concept_type, cls.TEMPLATES["concept"])
 
 
 class AnimationPlanner:
@@ -460,35 +522,41 @@ class AnimationPlanner:
         Returns:
             An enhanced animation plan
         """
-        # Create a copy of the basic plan to avoid modifying the original
+        # Shallow copy so the caller's top-level plan (or plan model) is left as-is
         enhanced_plan = dict(basic_plan)
         
-        # Enhance each section
-        for i, section in enumerate(enhanced_plan.get("sections", [])):
+        sections = enhanced_plan.get("sections", [])
+        
+        # Estimate all narration durations in one batch, consumed in section order
+        narration_durations = iter(self.timing_estimator.estimate_narration_durations(
+            [section["narration_summary"] for section in sections if "narration_summary" in section]
+        ).tolist())
+        
+        # Enhance each section and total the durations in the same pass
+        total_duration = 0.0
+        for i, section in enumerate(sections):
             # Ensure section has an ID
-            if "id" not in section:
-                section["id"] = f"section{i+1}"
+            section.setdefault("id", f"section{i+1}")
             
             # Apply templates for visual elements if none exist
-            if not section.get("visual_elements"):
-                section["visual_elements"] = self.templates.get_template(category)
+            visual_elements = section.get("visual_elements")
+            if not visual_elements:
+                visual_elements = section["visual_elements"] = self.templates.get_template(category)
             
-            # Improve timing estimates
+            # Improve timing estimates based on narration and visual elements
             if "narration_summary" in section:
-                narration = section["narration_summary"]
-                visual_elements = section.get("visual_elements", [])
-                
-                # Update duration based on narration and visual elements
                 section["duration"] = self.timing_estimator.estimate_section_duration(
-                    narration, visual_elements
+                    section["narration_summary"], visual_elements, next(narration_durations)
                 )
+            
+            total_duration += section.get("duration", 0)
         
         # Update the overall estimated duration
         if "sections" in enhanced_plan:
-            total_duration = sum(section.get("duration", 0) for section in enhanced_plan["sections"])
             enhanced_plan["estimated_duration"] = total_duration
         
-        # Validate and return the enhanced plan
+        # Validate and return the enhanced plan; the total was just summed from
+        # the sections, so it needs no reconciling against them
         return AnimationPlan(**enhanced_plan)
     
     def create_plan_from_explanation(self, explanation: str, category: str, title: str) -> AnimationPlan:
@@ -506,15 +574,20 @@ class AnimationPlanner:
         # Break down the explanation into sections
         sections_data = self.scene_breakdown.breakdown_explanation(explanation)
         
+        # Estimate all narration durations in one batch
+        narration_durations = self.timing_estimator.estimate_narration_durations(
+            [section_data["content"] for section_data in sections_data]
+        ).tolist()
+        
         # Create sections with visual elements and timing
         sections = []
-        for section_data in sections_data:
+        for section_data, narration_duration in zip(sections_data, narration_durations):
             # Get template visual elements for this category
             visual_elements = self.templates.get_template(category)
             
             # Estimate duration based on content and visual elements
             duration = self.timing_estimator.estimate_section_duration(
-                section_data["content"], visual_elements
+                section_data["content"], visual_elements, narration_duration
             )
             
             # Create the section
@@ -531,21 +604,21 @@ class AnimationPlanner:
         # Calculate total duration
         total_duration = sum(section["duration"] for section in sections)
         
-        # Create the visual style
-        visual_style = {
-            "color_theme": "dark",
-            "font_size": "medium",
-            "background_color": "#1C1C1C",
-            "accent_color": "#3B82F6"
-        }
+        # Create the visual style (built here, so no validation is needed)
+        visual_style = VisualStyle.model_construct(
+            color_theme="dark",
+            font_size="medium",
+            background_color="#1C1C1C",
+            accent_color="#3B82F6"
+        )
         
-        # Create the complete plan
+        # Create the complete plan; only the sections need validating, in one batch
         plan_dict = {
             "title": title,
-            "sections": sections,
+            "sections": _SECTIONS_ADAPTER.validate_python(sections),
             "estimated_duration": total_duration,
             "visual_style": visual_style
         }
         
-        # Validate and return the plan
-        return AnimationPlan(**plan_dict) 
\ No newline at end of file
+        # The total was just summed from these sections, so it needs no reconciling
+        return AnimationPlan.model_construct(**plan_dict) 
\ No newline at end of file
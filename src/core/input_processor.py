@@ -6,10 +6,13 @@ preparing them for the video generation pipeline.
 """
 
 import re
-import time
 import heapq
-from typing import Dict, Any, Optional, List, Tuple
-from pydantic import BaseModel, Field, validator
+from typing import Dict, Any, Optional, List, Tuple, Union
+from pydantic import BaseModel, Field, TypeAdapter, validator
+
+# Runs of whitespace, and whitespace that would change when collapsed to single spaces
+_WHITESPACE_RE = re.compile(r'\s+')
+_UNNORMALIZED_WHITESPACE_RE = re.compile(r'[^\S ]| {2}')
 
 
 class MathQuery(BaseModel):
@@ -25,8 +28,10 @@ class MathQuery(BaseModel):
     
     @validator('query')
     def validate_query(cls, v):
-        # Remove excessive whitespace
-        v = re.sub(r'\s+', ' ', v).strip()
+        # Remove excessive whitespace (already-clean queries only need stripping)
+        if _UNNORMALIZED_WHITESPACE_RE.search(v):
+            v = _WHITESPACE_RE.sub(' ', v)
+        v = v.strip()
         
         # Check for overly complex queries
         if len(v) > 300:
@@ -62,19 +67,45 @@ class MathQuery(BaseModel):
         return result
 
 
+# Category keywords in detection priority order, compiled into one pattern per category
+_CATEGORY_KEYWORDS = [
+    ("theorem", ["prove", "proof", "theorem", "lemma"]),
+    ("problem", ["solve", "find", "calculate", "compute"]),
+    ("concept", ["explain", "what is", "how does", "concept"]),
+    ("definition", ["define", "definition", "meaning"]),
+]
+_CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+    for category, keywords in _CATEGORY_KEYWORDS
+]
+
+# Validators built once and reused for batch validation
+_MATH_QUERY_ADAPTER = TypeAdapter(MathQuery)
+_QUERY_BATCH_ADAPTER = TypeAdapter(List[Dict[str, Any]])
+
+
 class QueryPriorityQueue:
     """
     Priority queue for managing multiple query requests.
     
-    Queries are processed based on their priority level and submission time.
+    Queries are processed based on their priority level and submission order.
     Higher priority queries are processed first, and for queries with the same
     priority, the oldest ones are processed first (FIFO).
+    
+    Follows the heapq documentation's priority queue recipe: each query ID maps
+    to its mutable heap entry, removed entries are marked in place and
+    discarded lazily when they reach the front of the heap.
     """
     
+    # Placeholder stored in the query slot of removed heap entries
+    _REMOVED = object()
+    
     def __init__(self):
         """Initialize an empty priority queue."""
-        self._queue = []  # List of (priority, timestamp, query_id, query) tuples
-        self._counter = 0  # Unique ID for each query
+        self._queue = []  # Heap of [priority, sequence, query_id, query] entries
+        self._index = {}  # query_id -> heap entry, for queries still waiting
+        self._counter = 0  # Unique, increasing ID for each query (FIFO tie-breaker)
+        self._removed_count = 0  # Removed entries still present in the heap
     
     def add_query(self, query: MathQuery) -> str:
         """
@@ -86,17 +117,28 @@ class QueryPriorityQueue:
         Returns:
             A unique ID for the query
         """
+        query_id = f"query_{self._counter}"
+        self._push(query_id, query)
+        return query_id
+    
+    def _push(self, query_id: str, query: MathQuery):
+        """Push a heap entry for a query."""
         # Invert priority so that higher values are processed first
         # (heapq is a min-heap, so lower values come out first)
         inverted_priority = -1 * (query.priority or 0)
-        timestamp = time.time()
-        query_id = f"query_{self._counter}"
-        self._counter += 1
         
-        # Add to the priority queue
-        heapq.heappush(self._queue, (inverted_priority, timestamp, query_id, query))
+        # The sequence number keeps equal priorities FIFO
+        entry = [inverted_priority, self._counter, query_id, query]
+        self._counter += 1
         
-        return query_id
+        self._index[query_id] = entry
+        heapq.heappush(self._queue, entry)
+    
+    def _discard_removed(self):
+        """Pop removed queries off the front of the heap."""
+        while self._queue and self._queue[0][3] is self._REMOVED:
+            heapq.heappop(self._queue)
+            self._removed_count -= 1
     
     def get_next_query(self) -> Tuple[str, MathQuery]:
         """
@@ -105,10 +147,12 @@ class QueryPriorityQueue:
         Returns:
             A tuple of (query_id, query) or (None, None) if the queue is empty
         """
+        self._discard_removed()
         if not self._queue:
             return None, None
             
         _, _, query_id, query = heapq.heappop(self._queue)
+        del self._index[query_id]
         return query_id, query
     
     def peek_next_query(self) -> Tuple[str, MathQuery]:
@@ -118,6 +162,7 @@ class QueryPriorityQueue:
         Returns:
             A tuple of (query_id, query) or (None, None) if the queue is empty
         """
+        self._discard_removed()
         if not self._queue:
             return None, None
             
@@ -134,23 +179,57 @@ class QueryPriorityQueue:
         Returns:
             True if the query was found and removed, False otherwise
         """
-        for i, (_, _, qid, _) in enumerate(self._queue):
-            if qid == query_id:
-                # Remove the item
-                self._queue.pop(i)
-                # Reheapify
-                heapq.heapify(self._queue)
-                return True
-                
-        return False
+        entry = self._index.pop(query_id, None)
+        if entry is None:
+            return False
+            
+        entry[3] = self._REMOVED
+        self._removed_count += 1
+        
+        # Compact once removed entries make up over half of the heap
+        if self._removed_count > len(self._queue) // 2:
+            self._queue = [entry for entry in self._queue if entry[3] is not self._REMOVED]
+            heapq.heapify(self._queue)
+            self._removed_count = 0
+            
+        return True
+    
+    def update_priority(self, query_id: str, priority: int) -> bool:
+        """
+        Change the priority of a queued query.
+        
+        The query keeps its ID but moves behind queries already waiting at
+        the new priority level.
+        
+        Args:
+            query_id: The ID of the query to update
+            priority: New priority level (0-10, higher is more important)
+            
+        Returns:
+            True if the query was found and updated, False otherwise
+        """
+        entry = self._index.get(query_id)
+        if entry is None:
+            return False
+            
+        # Re-validate so the priority range is still enforced
+        query = MathQuery(**{**entry[3].model_dump(), "priority": priority})
+        
+        self.remove_query(query_id)
+        self._push(query_id, query)
+        return True
+    
+    def contains(self, query_id: str) -> bool:
+        """Check if a query is still waiting in the queue."""
+        return query_id in self._index
     
     def is_empty(self) -> bool:
         """Check if the queue is empty."""
-        return len(self._queue) == 0
+        return not self._index
     
     def size(self) -> int:
         """Get the number of queries in the queue."""
-        return len(self._queue)
+        return len(self._index)
 
 
 class InputProcessor:
@@ -173,16 +252,27 @@ class InputProcessor:
         Returns:
             A validated MathQuery object
         """
-        # Auto-detect query category if not specified
-        if 'category' not in kwargs:
-            category = self._detect_category(query_text)
-            if category:
-                kwargs['category'] = category
+        self._fill_category(query_text, kwargs)
                 
         # Create and validate the query object
         query = MathQuery(query=query_text, **kwargs)
         return query
     
+    def _fill_category(self, query_text: str, fields: Dict[str, Any]) -> None:
+        """
+        Auto-detect the query category unless the caller specified one.
+        
+        Args:
+            query_text: The raw query text from the user
+            fields: Query fields, updated in place
+        """
+        if 'category' in fields:
+            return
+            
+        category = self._detect_category(query_text)
+        if category:
+            fields['category'] = category
+    
     def _detect_category(self, query_text: str) -> Optional[str]:
         """
         Automatically detect the category of a mathematical query.
@@ -193,20 +283,12 @@ class InputProcessor:
         Returns:
             The detected category or None if uncertain
         """
-        # Simple keyword-based detection
+        # Simple keyword-based detection, one regex scan per category
         query_lower = query_text.lower()
         
-        if any(keyword in query_lower for keyword in ["prove", "proof", "theorem", "lemma"]):
-            return "theorem"
-        
-        if any(keyword in query_lower for keyword in ["solve", "find", "calculate", "compute"]):
-            return "problem"
-        
-        if any(keyword in query_lower for keyword in ["explain", "what is", "how does", "concept"]):
-            return "concept"
-        
-        if any(keyword in query_lower for keyword in ["define", "definition", "meaning"]):
-            return "definition"
+        for category, pattern in _CATEGORY_PATTERNS:
+            if pattern.search(query_lower):
+                return category
             
         return None
     
@@ -250,12 +332,29 @@ class InputProcessor:
             if not query_text:
                 continue
                 
+            self._fill_category(query_text, query_dict)
+                
             try:
-                validated_query = self.process_query(query_text, **query_dict)
+                validated_query = _MATH_QUERY_ADAPTER.validate_python({"query": query_text, **query_dict})
                 query_id = self.priority_queue.add_query(validated_query)
                 validated_queries.append((query_id, validated_query))
             except Exception as e:
                 # Log the error but continue processing other queries
                 print(f"Error validating query '{query_text}': {str(e)}")
                 
-        return validated_queries 
\ No newline at end of file
+        return validated_queries 
+    
+    def validate_batch_queries_json(self, raw: Union[str, bytes]) -> List[Tuple[str, MathQuery]]:
+        """
+        Validate a JSON array of queries and add them to the priority queue.
+        
+        The payload is parsed directly by the validator instead of going
+        through json.loads first.
+        
+        Args:
+            raw: JSON array of query objects
+            
+        Returns:
+            List of (query_id, validated_query) tuples for successful validations
+        """
+        return self.validate_batch_queries(_QUERY_BATCH_ADAPTER.validate_json(raw))
@@ -6,23 +6,183 @@ and synchronization of audio and video components.
 """
 
 import os
+import ast
 import json
 import tempfile
 import asyncio
 import subprocess
+import threading
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
-import ffmpeg
 import re
 import shutil
 
 from pydantic import BaseModel, Field
+from tenacity import retry, stop_after_attempt, wait_exponential
 from src.utils.kokoro_voiceover import KokoroService
+from src.utils.render_cache import RenderCache, link_or_copy
+from src.utils.video_utils import MANIM_VERSION, get_stream_signature
 from src.utils.logging_utils import get_logger
-from src.config.config import Config
+from src.config.config import config
 
 logger = get_logger(__name__)
 
+# Stream buffer for subprocess output; Manim progress output easily exceeds the 64 KiB default
+_PIPE_BUFFER_LIMIT = 1 << 20
+
+# Nice increment for Manim renders, leaving the event loop room to service network I/O
+_RENDER_NICENESS = 5
+
+# One lock per scene name, since Manim writes each scene's partial movies to a fixed directory
+_MANIM_MEDIA_LOCKS: Dict[str, asyncio.Lock] = {}
+
+# Process-wide TTS service, so the Kokoro weights are loaded once rather than per video
+_TTS_SERVICE: Optional[KokoroService] = None
+_TTS_SERVICE_LOCK = threading.Lock()
+
+
+def _lower_render_priority(pid: int) -> None:
+    """
+    Deprioritize a Manim subprocess so it can't starve the event loop.
+    
+    Applied from the parent right after the spawn, rather than as a preexec_fn,
+    which is unsafe while this process runs other threads. Lowers the child's
+    nice level and, where supported, keeps it off the first CPU.
+    
+    Args:
+        pid: Process ID of the Manim subprocess
+    """
+    try:
+        if hasattr(os, "setpriority"):
+            os.setpriority(os.PRIO_PROCESS, pid, os.getpriority(os.PRIO_PROCESS, pid) + _RENDER_NICENESS)
+        if hasattr(os, "sched_setaffinity"):
+            cpus = os.sched_getaffinity(pid)
+            if len(cpus) > 1:
+                os.sched_setaffinity(pid, cpus - {min(cpus)})
+    except OSError as e:
+        # The render may already have exited, or the platform may refuse the change
+        logger.debug(f"Could not lower priority of Manim process {pid}: {e}")
+
+
+def _find_scene_class(code: str, default: str = "MathAnimation") -> str:
+    """
+    Find the name of the first Manim scene class defined in the code.
+    
+    Args:
+        code: Manim Python code
+        default: Name to fall back to if no scene class is found
+        
+    Returns:
+        Name of the scene class to render
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return default
+    
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            for base in node.bases:
+                # Matches Scene, ThreeDScene, VoiceoverScene, manim.Scene, ...
+                base_name = getattr(base, "id", None) or getattr(base, "attr", None) or ""
+                if base_name.endswith("Scene"):
+                    return node.name
+    return default
+
+
+def _warm_up_tts(service: KokoroService) -> None:
+    """
+    Run a throwaway synthesis so the first real voiceover doesn't pay the model's cold start.
+    
+    Args:
+        service: Kokoro speech service to warm up
+    """
+    try:
+        service.kokoro.create("Warm up.", voice=service.voice, speed=service.speed, lang=service.lang)
+        logger.info("TTS model warmed up")
+    except Exception as e:
+        logger.warning(f"TTS warm-up failed: {str(e)}")
+
+
+def _get_tts_service() -> KokoroService:
+    """
+    Get the shared TTS service, creating it on first use.
+    
+    The first call also starts a background warm-up synthesis, which overlaps
+    with the LLM stages that run before any narration is needed.
+    
+    Returns:
+        The process-wide Kokoro speech service
+    """
+    global _TTS_SERVICE
+    if _TTS_SERVICE is None:
+        with _TTS_SERVICE_LOCK:
+            if _TTS_SERVICE is None:
+                _TTS_SERVICE = KokoroService()
+                threading.Thread(target=_warm_up_tts, args=(_TTS_SERVICE,), daemon=True).start()
+    return _TTS_SERVICE
+
+
+async def _await_shielded(task: asyncio.Task) -> Any:
+    """
+    Wait for a task shared with other waiters without cancelling it on the way out.
+    
+    Args:
+        task: Shared task to wait for
+        
+    Returns:
+        The task's result
+    """
+    return await asyncio.shield(task)
+
+
+async def _probe_duration(path: str) -> float:
+    """
+    Get the duration of a media file with ffprobe.
+    
+    Args:
+        path: Path to the media file
+        
+    Returns:
+        Duration in seconds
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=nw=1:nk=1",
+        path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=_PIPE_BUFFER_LIMIT
+    )
+    stdout, stderr = await process.communicate()
+    
+    if process.returncode != 0:
+        raise RuntimeError(f"ffprobe failed for {path}: {stderr.decode()}")
+    
+    return float(stdout)
+
+
+async def _run_ffmpeg(args: List[str], input: Optional[bytes] = None) -> None:
+    """
+    Run ffmpeg with the given arguments, overwriting any existing output.
+    
+    Args:
+        args: ffmpeg arguments, excluding the executable
+        input: Data to feed to ffmpeg's stdin, read by inputs named pipe:0
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-y", "-loglevel", "error", *args,
+        stdin=asyncio.subprocess.PIPE if input is not None else None,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        limit=_PIPE_BUFFER_LIMIT
+    )
+    _, stderr = await process.communicate(input)
+    
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed with code {process.returncode}: {stderr.decode()}")
+
 
 class MediaSegment(BaseModel):
     """Data model for a media segment with synchronized audio and video."""
@@ -31,6 +191,7 @@ class MediaSegment(BaseModel):
     audio_path: str
     script: str
     duration: float
+    pad_duration: float = 0.0
     start_time: float = 0.0
 
 
@@ -39,7 +200,7 @@ class MediaProcessor:
     Handles the rendering of Manim animations and synchronization with audio.
     """
     
-    def __init__(self, output_dir: str = Config.OUTPUT_DIR):
+    def __init__(self, output_dir: str = config.OUTPUT_DIR):
         """
         Initialize the media processor.
         
@@ -50,7 +211,23 @@ class MediaProcessor:
         self.output_dir.mkdir(exist_ok=True, parents=True)
         
         # Initialize TTS service
-        self.tts_service = KokoroService()
+        self.tts_service = _get_tts_service()
+        
+        # Rendered videos are reused across runs when the Manim code is unchanged
+        self.render_cache = RenderCache()
+        
+        # Renders currently running, keyed by cache key, so sections with identical code share one
+        self.pending_renders: Dict[str, asyncio.Task] = {}
+        
+        # Manim's media dir outlives the run, so unchanged animations reuse their partial movie files
+        self.manim_media_dir = Path(config.MANIM_MEDIA_DIR).expanduser()
+        self.manim_media_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Bound concurrent heavyweight work so many sections don't oversubscribe the machine;
+        # TTS gets its own limit because the model may share a single GPU
+        self.render_sem = asyncio.Semaphore(config.MAX_PARALLEL_RENDERS)
+        self.ffmpeg_sem = asyncio.Semaphore(config.MAX_PARALLEL_FFMPEG)
+        self.tts_sem = asyncio.Semaphore(config.MAX_PARALLEL_TTS)
         
         # Create temporary directory for intermediate files
         self.temp_dir = Path(tempfile.mkdtemp())
@@ -74,11 +251,14 @@ class MediaProcessor:
         
         # Generate the audio file using the TTS service
         try:
-            result = self.tts_service.generate_from_text(
-                text=script,
-                cache_dir=str(self.temp_dir),
-                path=str(audio_path.name)
-            )
+            # Synthesis runs in a worker thread so LLM and render I/O keep progressing meanwhile
+            async with self.tts_sem:
+                result = await asyncio.to_thread(
+                    self.tts_service.generate_from_text,
+                    text=script,
+                    cache_dir=str(self.temp_dir),
+                    path=str(audio_path.name)
+                )
             
             # Get the full path to the generated file
             audio_path = self.temp_dir / result["original_audio"]
@@ -89,166 +269,123 @@ class MediaProcessor:
             logger.error(f"Failed to generate voiceover: {str(e)}")
             raise
     
-    async def run_manim_render(self, code: str, output_name: str) -> str:
+    async def run_manim_render(self, code: str, output_name: str, cache_bust: bool = False) -> str:
         """
         Run Manim to render the animation.
         
         Args:
             code: Manim Python code
             output_name: Base name for the output files
+            cache_bust: Render again even if this code has a cached video
             
         Returns:
             Path to the rendered video file
         """
         logger.info(f"Starting Manim rendering for {output_name}")
         
+        # Reuse an earlier render of identical code and settings
+        scene_class = _find_scene_class(code)
+        cache_key = self.render_cache.key(code, scene_class, "-qm", config.MANIM_FRAME_RATE, MANIM_VERSION)
+        cached_video = None if cache_bust else self.render_cache.get(cache_key)
+        if cached_video is not None:
+            video_file = self.temp_dir / f"{output_name}_cached.mp4"
+            link_or_copy(cached_video, video_file)
+            logger.info(f"Using cached render for {output_name}: {video_file}")
+            return str(video_file)
+        
+        # Join a render of the same code that is already running instead of starting another
+        render = None if cache_bust else self.pending_renders.get(cache_key)
+        if render is None:
+            render = asyncio.create_task(self._render_uncached(code, output_name, scene_class, cache_key))
+            self.pending_renders[cache_key] = render
+            
+            def forget_render(task: asyncio.Task) -> None:
+                # A cache-busting render may have replaced this one in the meantime
+                if self.pending_renders.get(cache_key) is task:
+                    del self.pending_renders[cache_key]
+            
+            render.add_done_callback(forget_render)
+        else:
+            logger.info(f"Waiting for identical render already in progress for {output_name}")
+        
+        # Shielded, since other sections may be waiting on the same render
+        return await _await_shielded(render)
+    
+    async def _render_uncached(self, code: str, output_name: str, scene_class: str, cache_key: str) -> str:
+        """
+        Render the animation with Manim and store the result in the render cache.
+        
+        Args:
+            code: Manim Python code
+            output_name: Base name for the output files
+            scene_class: Name of the scene class to render
+            cache_key: Render cache key for this code and its settings
+            
+        Returns:
+            Path to the rendered video file
+        """
         # Save the Manim code to a temporary Python file
         code_file = self.temp_dir / f"{output_name}.py"
         with open(code_file, "w") as f:
             f.write(code)
         
-        # Run Manim with the -qm (medium quality) flag for faster rendering
+        # Run Manim with the -qm (medium quality) flag for faster rendering. The media
+        # directory persists across runs so Manim can reuse its partial movie files
         cmd = [
             "python3", "-m", "manim", 
             str(code_file),
-            "MathAnimation",  # assuming the scene class is named MathAnimation
+            scene_class,  # render only the first scene, not every scene in the file
             "-qm",
-            "--media_dir", str(self.temp_dir)
+            "--media_dir", str(self.manim_media_dir)
         ]
         
         # Execute the command and capture output
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                logger.error(f"Manim rendering failed: {stderr.decode()}")
-                raise Exception(f"Manim rendering failed with code {process.returncode}")
-            
-            # Parse the output to find the rendered video file path
-            output = stdout.decode()
-            logger.debug(f"Manim output: {output}")
-            
-            # Video is usually in media/videos/{output_name}/MathAnimation.mp4
-            video_dir = self.temp_dir / "media" / "videos" / output_name
-            video_file = video_dir / "MathAnimation.mp4"
-            
-            if not video_file.exists():
-                # Try to find the video file by glob pattern
-                video_files = list(video_dir.glob("*.mp4"))
-                if video_files:
-                    video_file = video_files[0]
-                else:
-                    raise FileNotFoundError(f"Could not find rendered video file in {video_dir}")
-            
-            logger.info(f"Manim rendering completed: {video_file}")
-            return str(video_file)
-            
-        except Exception as e:
-            logger.error(f"Error running Manim: {str(e)}")
-            raise
-    
-    async def synchronize_audio_video(
-        self, 
-        video_path: str, 
-        audio_path: str, 
-        output_path: str,
-        extend_last_frame: bool = True
-    ) -> str:
-        """
-        Synchronize audio with video, extending the last frame if audio is longer.
-        
-        Args:
-            video_path: Path to the video file
-            audio_path: Path to the audio file
-            output_path: Path for the synchronized output
-            extend_last_frame: Whether to extend the last frame if audio is longer
-            
-        Returns:
-            Path to the synchronized video file
-        """
-        logger.info(f"Synchronizing audio and video: {os.path.basename(video_path)} + {os.path.basename(audio_path)}")
-        
-        try:
-            # Get durations
-            video_duration = float(ffmpeg.probe(video_path)["format"]["duration"])
-            audio_duration = float(ffmpeg.probe(audio_path)["format"]["duration"])
-            
-            logger.info(f"Video duration: {video_duration}s, Audio duration: {audio_duration}s")
-            
-            if audio_duration > video_duration and extend_last_frame:
-                logger.info(f"Audio is longer than video by {audio_duration - video_duration}s, extending last frame")
-                
-                # Extract the last frame
-                last_frame_path = self.temp_dir / "last_frame.png"
-                (
-                    ffmpeg
-                    .input(video_path, ss=video_duration-0.1)
-                    .output(str(last_frame_path), vframes=1)
-                    .run(quiet=True, overwrite_output=True)
+            # Renders of the same scene name share a directory in the media dir
+            async with _MANIM_MEDIA_LOCKS.setdefault(output_name, asyncio.Lock()), self.render_sem:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=_PIPE_BUFFER_LIMIT
                 )
+                _lower_render_priority(process.pid)
                 
-                # Create an extended video with the last frame held
-                extended_video_path = self.temp_dir / "extended_video.mp4"
-                extended_duration = audio_duration - video_duration
+                stdout, stderr = await process.communicate()
                 
-                # First, create a video of the last frame with the required duration
-                (
-                    ffmpeg
-                    .input(str(last_frame_path), loop=1, t=extended_duration)
-                    .output(str(self.temp_dir / "last_frame_video.mp4"), vcodec="libx264", pix_fmt="yuv420p")
-                    .run(quiet=True, overwrite_output=True)
-                )
+                if process.returncode != 0:
+                    logger.error(f"Manim rendering failed: {stderr.decode()}")
+                    raise Exception(f"Manim rendering failed with code {process.returncode}")
                 
-                # Then concatenate the original video with the last frame video
-                concat_file = self.temp_dir / "concat.txt"
-                with open(concat_file, "w") as f:
-                    f.write(f"file '{video_path}'\nfile '{self.temp_dir / 'last_frame_video.mp4'}'")
+                # Parse the output to find the rendered video file path
+                output = stdout.decode()
+                logger.debug(f"Manim output: {output}")
                 
-                (
-                    ffmpeg
-                    .input(str(concat_file), format="concat", safe=0)
-                    .output(str(extended_video_path), c="copy")
-                    .run(quiet=True, overwrite_output=True)
-                )
+                # Video is usually in videos/{output_name}/{quality}/{scene_class}.mp4
+                video_dir = self.manim_media_dir / "videos" / output_name
+                video_files = list(video_dir.glob(f"*/{scene_class}.mp4")) or list(video_dir.glob("*/*.mp4"))
+                if not video_files:
+                    raise FileNotFoundError(f"Could not find rendered video file in {video_dir}")
                 
-                # Use the extended video for synchronization
-                video_to_use = str(extended_video_path)
-            else:
-                video_to_use = video_path
-            
-            # Add audio to the video
-            (
-                ffmpeg
-                .input(video_to_use)
-                .input(audio_path)
-                .output(
-                    output_path, 
-                    vcodec="copy", 
-                    acodec="aac", 
-                    strict="experimental", 
-                    shortest=False
-                )
-                .run(quiet=True, overwrite_output=True)
-            )
+                # Move the render out before another run of this scene overwrites it
+                video_file = self.temp_dir / f"{output_name}.mp4"
+                shutil.move(max(video_files, key=os.path.getmtime), video_file)
             
-            logger.info(f"Synchronized media created: {output_path}")
-            return output_path
+            logger.info(f"Manim rendering completed: {video_file}")
+            self.render_cache.put(cache_key, str(video_file))
+            return str(video_file)
             
         except Exception as e:
-            logger.error(f"Error synchronizing audio and video: {str(e)}")
+            logger.error(f"Error running Manim: {str(e)}")
             raise
     
+    @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=1, min=1, max=5), reraise=True)
     async def process_section(
         self, 
         section_id: str,
         script: str,
         manim_code: str,
+        voice_task: Optional[asyncio.Task] = None,
     ) -> MediaSegment:
         """
         Process a single section of the video.
@@ -257,37 +394,89 @@ class MediaProcessor:
             section_id: Section identifier
             script: Narration script
             manim_code: Manim code for the section
+            voice_task: Voiceover already being generated for this script, shared
+                between sections with identical narration
             
         Returns:
-            Media segment with synchronized audio and video
+            Media segment with the raw audio and video, muxed later by combine_segments
+            
+        Raises:
+            Exception: The first error from the voiceover or the render
         """
         logger.info(f"Processing section: {section_id}")
         
-        # Generate tasks for concurrent processing
-        voice_task = asyncio.create_task(self.generate_voiceover(section_id, script))
-        render_task = asyncio.create_task(self.run_manim_render(manim_code, section_id))
+        # A failed task keeps its exception, so a retry synthesizes the voiceover afresh
+        if voice_task is not None and voice_task.done() and (voice_task.cancelled() or voice_task.exception()):
+            voice_task = None
         
-        # Wait for both tasks to complete
-        audio_path, video_path = await asyncio.gather(voice_task, render_task)
+        # Run both concurrently; if either fails the other is cancelled right away
+        try:
+            async with asyncio.TaskGroup() as tg:
+                if voice_task is None:
+                    audio_task = tg.create_task(self.generate_voiceover(section_id, script))
+                else:
+                    # Shielded, since other sections may still be waiting on the shared voiceover
+                    audio_task = tg.create_task(_await_shielded(voice_task))
+                render_task = tg.create_task(self.run_manim_render(manim_code, section_id))
+        except ExceptionGroup as eg:
+            # Surface the actual failure rather than the TaskGroup wrapper
+            raise eg.exceptions[0]
         
-        # Synchronize audio and video
-        output_path = str(self.temp_dir / f"{section_id}_synchronized.mp4")
-        synchronized_path = await self.synchronize_audio_video(video_path, audio_path, output_path)
+        audio_path, video_path = audio_task.result(), render_task.result()
         
-        # Get the duration of the synchronized video
-        duration = float(ffmpeg.probe(synchronized_path)["format"]["duration"])
+        # Work out how long the last frame must be held to cover the narration
+        video_duration, audio_duration = await asyncio.gather(
+            _probe_duration(video_path),
+            _probe_duration(audio_path)
+        )
         
         # Create and return the media segment
         segment = MediaSegment(
             section_id=section_id,
-            video_path=synchronized_path,
+            video_path=video_path,
             audio_path=audio_path,
             script=script,
-            duration=duration
+            duration=max(video_duration, audio_duration),
+            pad_duration=max(0.0, audio_duration - video_duration)
         )
         
         return segment
     
+    async def _mux_segment(self, segment: MediaSegment) -> str:
+        """
+        Mux a section's narration onto its video.
+        
+        The video stream is copied unless the last frame must be held to cover
+        the narration, in which case only this section is re-encoded with tpad.
+        
+        Args:
+            segment: Media segment to mux
+            
+        Returns:
+            Path to the muxed section video
+        """
+        output_path = self.temp_dir / f"{segment.section_id}_muxed.mp4"
+        
+        if segment.pad_duration > 0:
+            video_args = [
+                "-filter_complex", f"[0:v]tpad=stop_mode=clone:stop_duration={segment.pad_duration}[v]",
+                "-map", "[v]", "-map", "1:a",
+                "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            ]
+        else:
+            video_args = ["-map", "0:v", "-map", "1:a", "-c:v", "copy"]
+        
+        async with self.ffmpeg_sem:
+            await _run_ffmpeg([
+                "-i", segment.video_path,
+                "-i", segment.audio_path,
+                *video_args,
+                "-c:a", "aac",
+                str(output_path)
+            ])
+        
+        return str(output_path)
+    
     async def combine_segments(self, segments: List[MediaSegment], output_name: str) -> str:
         """
         Combine multiple media segments into a final video.
@@ -304,30 +493,54 @@ class MediaProcessor:
         # Sort segments by section_id
         sorted_segments = sorted(segments, key=lambda s: s.section_id)
         
-        # Create a file listing all segments for concatenation
-        concat_file = self.temp_dir / "concat_final.txt"
-        with open(concat_file, "w") as f:
-            for segment in sorted_segments:
-                f.write(f"file '{segment.video_path}'\n")
-        
         # Output path for the final video
         final_output = self.output_dir / f"{output_name}.mp4"
         
-        # Combine all segments using FFmpeg
-        (
-            ffmpeg
-            .input(str(concat_file), format="concat", safe=0)
-            .output(str(final_output), c="copy")
-            .run(quiet=True, overwrite_output=True)
-        )
+        # Mux each section; only sections whose narration outlasts the animation are re-encoded
+        muxed_paths = await asyncio.gather(*(self._mux_segment(segment) for segment in sorted_segments))
+        
+        # Padded sections are our own encodes, so check they match the copied ones before a stream copy
+        signatures = await asyncio.gather(*(asyncio.to_thread(get_stream_signature, path) for path in muxed_paths))
+        
+        if len(set(signatures)) == 1:
+            # The concat list goes to ffmpeg over stdin instead of through a file
+            concat_list = "".join(
+                "file '" + os.path.abspath(path).replace("'", "'\\''") + "'\n" for path in muxed_paths
+            )
+            
+            async with self.ffmpeg_sem:
+                await _run_ffmpeg([
+                    "-f", "concat", "-safe", "0",
+                    "-protocol_whitelist", "file,pipe",
+                    "-i", "pipe:0",
+                    "-c", "copy",
+                    str(final_output)
+                ], input=concat_list.encode())
+        else:
+            logger.info("Sections have mismatched stream parameters, re-encoding while combining")
+            
+            inputs = []
+            for path in muxed_paths:
+                inputs += ["-i", path]
+            streams = "".join(f"[{i}:v:0][{i}:a:0]" for i in range(len(muxed_paths)))
+            
+            async with self.ffmpeg_sem:
+                await _run_ffmpeg([
+                    *inputs,
+                    "-filter_complex", f"{streams}concat=n={len(muxed_paths)}:v=1:a=1[v][a]",
+                    "-map", "[v]", "-map", "[a]",
+                    "-c:v", "libx264", "-pix_fmt", "yuv420p",
+                    "-c:a", "aac",
+                    str(final_output)
+                ])
         
         logger.info(f"Final video created: {final_output}")
         return str(final_output)
     
-    def cleanup(self):
-        """Clean up temporary files."""
+    async def cleanup(self):
+        """Clean up temporary files without blocking the event loop."""
         logger.info(f"Cleaning up temporary directory: {self.temp_dir}")
-        shutil.rmtree(self.temp_dir)
+        await asyncio.to_thread(shutil.rmtree, self.temp_dir, ignore_errors=True)
 
 
 class VideoGenerator:
@@ -335,7 +548,7 @@ class VideoGenerator:
     High-level interface for generating complete educational videos.
     """
     
-    def __init__(self, output_dir: str = Config.OUTPUT_DIR):
+    def __init__(self, output_dir: str = config.OUTPUT_DIR):
         """
         Initialize the video generator.
         
@@ -346,12 +559,38 @@ class VideoGenerator:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
     
+    def start_voiceovers(self, scripts: Dict[str, str]) -> Dict[str, asyncio.Task]:
+        """
+        Start synthesizing narration in the background.
+        
+        Each distinct script is synthesized once; sections repeating a script
+        share its audio.
+        
+        Args:
+            scripts: Dictionary mapping section IDs to narration scripts
+            
+        Returns:
+            Dictionary mapping each distinct script to its voiceover task
+        """
+        voice_tasks = {}
+        for section_id, script in scripts.items():
+            if script not in voice_tasks:
+                voice_tasks[script] = asyncio.create_task(
+                    self.media_processor.generate_voiceover(section_id, script)
+                )
+        
+        if len(voice_tasks) < len(scripts):
+            logger.info(f"Synthesizing {len(voice_tasks)} unique scripts for {len(scripts)} sections")
+        
+        return voice_tasks
+    
     async def generate_video(
         self, 
         scripts: Dict[str, str],
         manim_code: str,
         title: str,
-        metadata: Dict[str, Any] = None
+        metadata: Dict[str, Any] = None,
+        voice_tasks: Optional[Dict[str, asyncio.Task]] = None
     ) -> str:
         """
         Generate a complete video with synchronized audio and animations.
@@ -361,22 +600,27 @@ class VideoGenerator:
             manim_code: Complete Manim code for all sections
             title: Video title
             metadata: Additional metadata to save with the video
+            voice_tasks: Voiceovers already started with start_voiceovers
             
         Returns:
             Path to the final video file
         """
+        if voice_tasks is None:
+            voice_tasks = self.start_voiceovers(scripts)
+        
         try:
             logger.info(f"Starting video generation for: {title}")
             
             # Process the sections concurrently
-            sections = []
             tasks = []
             
             for section_id, script in scripts.items():
                 # Each section needs its own Manim code
                 # For now, we'll use the same code for all sections
                 # In a more sophisticated implementation, we'd split the code by section
-                task = self.media_processor.process_section(section_id, script, manim_code)
+                task = self.media_processor.process_section(
+                    section_id, script, manim_code, voice_task=voice_tasks[script]
+                )
                 tasks.append(task)
             
             # Wait for all section processing to complete
@@ -393,13 +637,24 @@ class VideoGenerator:
                     json.dump(metadata, f, indent=2)
             
             # Clean up temporary files
-            self.media_processor.cleanup()
+            await self.media_processor.cleanup()
             
             logger.info(f"Video generation completed: {final_video_path}")
             return final_video_path
             
         except Exception as e:
             logger.error(f"Error generating video: {str(e)}")
+            self.cancel_voiceovers(voice_tasks)
             # Attempt cleanup even on failure
-            self.media_processor.cleanup()
-            raise 
\ No newline at end of file
+            await self.media_processor.cleanup()
+            raise 
+    
+    def cancel_voiceovers(self, voice_tasks: Dict[str, asyncio.Task]):
+        """
+        Cancel voiceovers that are still being synthesized.
+        
+        Args:
+            voice_tasks: Voiceover tasks from start_voiceovers
+        """
+        for task in voice_tasks.values():
+            task.cancel()
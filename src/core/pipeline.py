@@ -10,37 +10,49 @@ import os
 import asyncio
 import time
 from typing import Dict, Any, Optional, List, Tuple
-import json
 from pathlib import Path
 
+import httpx
+import orjson
+
 from src.core.input_processor import InputProcessor, MathQuery
 from src.core.ai_manager import AIManager, AnimationPlan
 from src.core.media_processor import VideoGenerator
 from src.utils.logging_utils import get_logger, ProgressLogger
-from src.config.config import Config
+from src.config.config import config
 
 logger = get_logger(__name__)
 
 
+def _write_files(directory: Path, blobs: Dict[str, bytes]) -> None:
+    """
+    Write several files into a directory.
+    
+    Args:
+        directory: Directory to write into
+        blobs: Mapping of file names to their contents
+    """
+    for name, data in blobs.items():
+        (directory / name).write_bytes(data)
+
+
 class VideoGenerationPipeline:
     """
     End-to-end pipeline for generating educational math videos.
     """
     
     def __init__(self, 
-                 openai_api_key: Optional[str] = None,
-                 anthropic_api_key: Optional[str] = None,
-                 output_dir: str = Config.OUTPUT_DIR):
+                 output_dir: str = config.OUTPUT_DIR,
+                 http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the video generation pipeline.
         
         Args:
-            openai_api_key: API key for OpenAI services
-            anthropic_api_key: API key for Anthropic services
             output_dir: Directory for output files
+            http_client: Optional shared HTTP client for AI requests
         """
         self.input_processor = InputProcessor()
-        self.ai_manager = AIManager(openai_api_key, anthropic_api_key)
+        self.ai_manager = AIManager(config, http_client=http_client)
         self.video_generator = VideoGenerator(output_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
@@ -87,15 +99,21 @@ class VideoGenerationPipeline:
             animation_plan = await self.ai_manager.create_animation_plan(query_dict, explanation)
             self.progress.end_stage("animation_planning")
             
-            # Stage 4: Generate content concurrently (script + manim code)
+            # Stage 4: Generate content (script + manim code)
             self.progress.start_stage("content_generation")
-            scripts, manim_code = await self.ai_manager.generate_content_concurrently(
-                query_dict, explanation, animation_plan
-            )
+            scripts = await self.ai_manager.generate_script(animation_plan, explanation, query_dict)
+            
+            # Narration only depends on the scripts, so synthesize it while the Manim code is generated
+            voice_tasks = self.video_generator.start_voiceovers(scripts)
+            try:
+                manim_code = await self.ai_manager.generate_manim_code(animation_plan, scripts, query_dict)
+            except Exception:
+                self.video_generator.cancel_voiceovers(voice_tasks)
+                raise
             self.progress.end_stage("content_generation")
             
             # Save intermediate outputs for debugging/analysis
-            self._save_intermediate_outputs(
+            await self._save_intermediate_outputs(
                 query_dict, explanation, animation_plan, scripts, manim_code
             )
             
@@ -112,7 +130,8 @@ class VideoGenerationPipeline:
                     "animation_plan": animation_plan.dict(),
                     "generation_timestamp": time.time(),
                     "performance_metrics": self.metrics
-                }
+                },
+                voice_tasks=voice_tasks
             )
             self.progress.end_stage("media_production")
             
@@ -134,7 +153,7 @@ class VideoGenerationPipeline:
             self.metrics["total_duration"] = self.metrics["end_time"] - self.metrics["start_time"]
             raise
     
-    def _save_intermediate_outputs(
+    async def _save_intermediate_outputs(
         self,
         query: Dict[str, Any],
         explanation: str,
@@ -157,29 +176,22 @@ class VideoGenerationPipeline:
         intermediate_dir = self.output_dir / f"intermediate_{timestamp}"
         intermediate_dir.mkdir(exist_ok=True)
         
-        # Save each component
-        with open(intermediate_dir / "query.json", "w") as f:
-            json.dump(query, f, indent=2)
-            
-        with open(intermediate_dir / "explanation.txt", "w") as f:
-            f.write(explanation)
-            
-        with open(intermediate_dir / "animation_plan.json", "w") as f:
-            json.dump(animation_plan.dict(), f, indent=2)
-            
-        with open(intermediate_dir / "scripts.json", "w") as f:
-            json.dump(scripts, f, indent=2)
-            
-        with open(intermediate_dir / "manim_code.py", "w") as f:
-            f.write(manim_code)
+        # Encode each component, then write them all in one worker thread
+        blobs = {
+            "query.json": orjson.dumps(query, option=orjson.OPT_INDENT_2),
+            "explanation.txt": explanation.encode("utf-8"),
+            "animation_plan.json": orjson.dumps(animation_plan.model_dump(), option=orjson.OPT_INDENT_2),
+            "scripts.json": orjson.dumps(scripts, option=orjson.OPT_INDENT_2),
+            "manim_code.py": manim_code.encode("utf-8"),
+        }
+        await asyncio.to_thread(_write_files, intermediate_dir, blobs)
             
         logger.info(f"Saved intermediate outputs to {intermediate_dir}")
 
 
 async def generate_math_video(
     query: str, 
-    openai_api_key: Optional[str] = None,
-    anthropic_api_key: Optional[str] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
     **kwargs
 ) -> Tuple[str, Dict[str, Any]]:
     """
@@ -187,16 +199,12 @@ async def generate_math_video(
     
     Args:
         query: Mathematical topic or problem to explain
-        openai_api_key: API key for OpenAI services
-        anthropic_api_key: API key for Anthropic services
+        http_client: Optional shared HTTP client for AI requests
         **kwargs: Additional customization parameters
         
     Returns:
         Tuple of (final_video_path, metrics)
     """
-    pipeline = VideoGenerationPipeline(
-        openai_api_key=openai_api_key,
-        anthropic_api_key=anthropic_api_key
-    )
+    pipeline = VideoGenerationPipeline(http_client=http_client)
     
     return await pipeline.generate_video(query, **kwargs) 
\ No newline at end of file
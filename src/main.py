@@ -4,17 +4,18 @@ Main entry point for the Manim Video Agent application.
 
 import argparse
 import asyncio
-import json
 import os
 from pathlib import Path
 import sys
 import time
 
-from src.config.config import Config
+import orjson
+
+from src.config.config import Config, config
 from src.core.ai_manager import AIManager
 from src.core.animation_planner import AnimationPlan, Scene
 from src.utils.kokoro_voiceover import generate_audio_for_scenes
-from src.utils.video_utils import process_scene_videos, create_final_video
+from src.utils.video_utils import process_scene_videos_from_queue, create_final_video, use_pidfd_child_watcher
 from src.utils.logging_utils import get_logger
 from src.utils.background_timer import BackgroundTimer
 
@@ -45,56 +46,59 @@ async def generate_video(problem: str, output_dir: str, config: Config, use_cach
     solution = await ai_manager.solve_or_explain(problem)
     step_timer.stop()
     
-    with open(output_path / "solution.txt", "w") as f:
-        f.write(solution)
+    await asyncio.to_thread((output_path / "solution.txt").write_text, solution)
     
     # Step 2: Create scene-based animation plan with o3-mini
     logger.info("Creating scene-based animation plan...")
     step_timer.start()
     scene_plan = await ai_manager.create_scene_plan(problem, solution)
     step_timer.stop()
-    with open(output_path / "scene_plan.json", "w") as f:
-        json.dump(scene_plan, f, indent=2)
+    await asyncio.to_thread(
+        (output_path / "scene_plan.json").write_bytes,
+        orjson.dumps(scene_plan, option=orjson.OPT_INDENT_2)
+    )
     
-    # Step 3: Process each scene using Gemini and Claude
+    # Step 3: Process all scenes concurrently using Gemini and Claude
     logger.info("Processing scenes...")
     step_timer.start()
-    scenes = []
-    for scene_data in scene_plan.get("scenes", []):
-        logger.info(f"Processing scene: {scene_data.get('id', 'unknown')}")
-        
-        scene = await ai_manager.process_scene(
+    scenes = await asyncio.gather(*(
+        ai_manager.process_scene(
             scene_data=scene_data,
             query=problem,
             explanation=solution,
             output_dir=output_path
         )
-        
-        scenes.append(scene)
+        for scene_data in scene_plan.get("scenes", [])
+    ))
     step_timer.stop()
     
     # Save the list of scenes
     scenes_data = [scene.model_dump() for scene in scenes]
-    with open(output_path / "scenes.json", "w") as f:
-        json.dump(scenes_data, f, indent=2)
+    await asyncio.to_thread(
+        (output_path / "scenes.json").write_bytes,
+        orjson.dumps(scenes_data, option=orjson.OPT_INDENT_2)
+    )
     
-    # Step 4 & 5: Generate audio and video for each scene in parallel
-    logger.info("Generating audio and video code concurrently for all scenes...")
+    # Step 4, 5 & 6: Generate audio and process each scene's video as soon as its audio is ready
+    logger.info("Generating audio and processing videos for all scenes...")
     step_timer.start()
     
-    # Use the async version for batch processing of all scenes
-    scenes_with_audio = await generate_audio_for_scenes(scenes, output_path)
-    step_timer.stop()
-    
-    # Step 6: Process videos with the audio
-    logger.info("Processing videos for all scenes...")
-    step_timer.start()
-    final_scenes = await process_scene_videos(
-        scenes_with_audio, 
-        output_path, 
-        ai_manager=ai_manager,
-        max_retries=None  # No limit on retries
-    )
+    # Audio generation feeds finished scenes into the queue while videos are processed
+    scene_queue = asyncio.Queue()
+    audio_task = asyncio.create_task(generate_audio_for_scenes(scenes, output_path, queue=scene_queue))
+    try:
+        final_scenes = await process_scene_videos_from_queue(
+            scene_queue, 
+            output_path, 
+            ai_manager=ai_manager,
+            max_retries=None  # No limit on retries
+        )
+    finally:
+        # Stop generating audio nobody will use if video processing failed
+        if not audio_task.done():
+            audio_task.cancel()
+        await asyncio.wait([audio_task])
+    await audio_task
     step_timer.stop()
     # Step 7: Stitch all scene videos together
     logger.info("Creating final video...")
@@ -123,9 +127,6 @@ def main():
     parser.add_argument("--no-cache", action="store_true", help="Disable caching of AI responses")
     args = parser.parse_args()
     
-    # Load configuration
-    config = Config()
-    
     # Check for required API keys
     if not config.OPENAI_API_KEY:
         logger.error("OpenAI API key not found. Please set the OPENAI_API_KEY environment variable.")
@@ -142,6 +143,9 @@ def main():
     timer = BackgroundTimer(prefix="Total runtime: ")
     timer.start()
 
+    # Reap the many Manim and ffmpeg children via pidfds where supported
+    use_pidfd_child_watcher()
+    
     try:
         # Run the video generation process
         asyncio.run(generate_video(args.problem, args.output, config, use_cache=not args.no_cache))
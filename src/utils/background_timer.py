@@ -9,41 +9,38 @@ class BackgroundTimer:
         self.timer_thread = None
         self.start_time = None
         self.prefix = prefix
-        self.last_print_length = 0
-        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
     
     def start(self):
         if not self.running:
             self.running = True
             self.start_time = time.time()
+            self._stop_event.clear()
             self.timer_thread = threading.Thread(target=self._run_timer)
             self.timer_thread.daemon = True
             self.timer_thread.start()
     
     def stop(self):
         self.running = False
+        self._stop_event.set()
         if self.timer_thread and self.timer_thread.is_alive():
             self.timer_thread.join(timeout=1.0)
         
-        # Clear the last timer line
-        with self._lock:
-            sys.stdout.write('\r' + ' ' * self.last_print_length + '\r')
-            sys.stdout.flush()
+        # Clear the last timer line; the timer thread has exited, so no lock is needed
+        sys.stdout.write('\x1b[2K\r')
+        sys.stdout.flush()
     
     def _run_timer(self):
-        while self.running:
+        # Wakes once a second, or immediately when stopped
+        while not self._stop_event.is_set():
             elapsed = time.time() - self.start_time
             elapsed_td = timedelta(seconds=int(elapsed))
             
             # Format as HH:MM:SS
             timer_display = f"{self.prefix}{elapsed_td}"
             
-            with self._lock:
-                # Clear previous line
-                sys.stdout.write('\r' + ' ' * self.last_print_length + '\r')
-                # Write new timer
-                sys.stdout.write(timer_display)
-                sys.stdout.flush()
-                self.last_print_length = len(timer_display)
+            # Erase the line and redraw it in a single write; the terminal clears leftover characters
+            sys.stdout.write(f'\x1b[2K\r{timer_display}')
+            sys.stdout.flush()
             
-            time.sleep(1)  # Update every second
\ No newline at end of file
+            self._stop_event.wait(1)  # Update every second
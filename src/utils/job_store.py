@@ -0,0 +1,236 @@
+"""
+Job state storage for the Manim Video Generator API.
+
+Jobs are kept in process memory by default. When a Redis URL is configured,
+job state is stored in Redis instead so that every API worker process sees
+the same jobs.
+
+Both stores can also stream job updates to subscribers via ``watch``.
+"""
+
+import json
+import asyncio
+from typing import Dict, Any, Optional, List, AsyncIterator
+
+from src.config.config import config
+from src.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Job statuses after which no further updates are published
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class InMemoryJobStore:
+    """
+    Job store backed by a process-local dictionary.
+    """
+
+    def __init__(self):
+        """Initialize an empty job store."""
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def create(self, job_id: str, job: Dict[str, Any]) -> None:
+        """
+        Store a new job.
+
+        Args:
+            job_id: Unique job identifier
+            job: Initial job state
+        """
+        self._jobs[job_id] = dict(job)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of a job.
+
+        Args:
+            job_id: Unique job identifier
+
+        Returns:
+            The job state or None if the job does not exist
+        """
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def update(self, job_id: str, **fields) -> None:
+        """
+        Update fields of an existing job.
+
+        Args:
+            job_id: Unique job identifier
+            **fields: Job fields to update
+        """
+        job = self._jobs.setdefault(job_id, {"job_id": job_id})
+        job.update(fields)
+        
+        for queue in self._subscribers.get(job_id, []):
+            queue.put_nowait(dict(job))
+
+    async def list_jobs(self) -> List[Dict[str, Any]]:
+        """
+        List all known jobs.
+
+        Returns:
+            List of job states
+        """
+        return [dict(job) for job in self._jobs.values()]
+
+    async def watch(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the state of a job each time it changes.
+
+        The current state is yielded first; the stream ends once the job
+        reaches a terminal status.
+
+        Args:
+            job_id: Unique job identifier
+
+        Yields:
+            Job states
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(queue)
+        try:
+            job = await self.get(job_id)
+            while job is not None:
+                yield job
+                if job.get("status") in TERMINAL_STATUSES:
+                    break
+                job = await queue.get()
+        finally:
+            subscribers = self._subscribers.get(job_id, [])
+            subscribers.remove(queue)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+
+class RedisJobStore:
+    """
+    Job store backed by Redis, shared across API worker processes.
+
+    Each job is stored as a JSON blob under ``job:{job_id}`` with a TTL so
+    finished jobs are evicted automatically. Updates are also published on the
+    ``job:{job_id}:events`` channel for ``watch`` subscribers in any worker.
+    """
+
+    KEY_PREFIX = "job:"
+
+    def __init__(self, url: str, ttl: int = config.JOB_TTL_SECONDS):
+        """
+        Initialize the Redis job store.
+
+        Args:
+            url: Redis connection URL
+            ttl: Time-to-live for job entries in seconds
+        """
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(url)
+        self.ttl = ttl
+        logger.info("Using Redis job store")
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}:events"
+
+    async def create(self, job_id: str, job: Dict[str, Any]) -> None:
+        """
+        Store a new job.
+
+        Args:
+            job_id: Unique job identifier
+            job: Initial job state
+        """
+        await self.redis.set(self._key(job_id), json.dumps(job), ex=self.ttl)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of a job.
+
+        Args:
+            job_id: Unique job identifier
+
+        Returns:
+            The job state or None if the job does not exist
+        """
+        raw = await self.redis.get(self._key(job_id))
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def update(self, job_id: str, **fields) -> None:
+        """
+        Update fields of an existing job.
+
+        Jobs are only written by the background task that owns them, so a
+        plain read-modify-write is sufficient.
+
+        Args:
+            job_id: Unique job identifier
+            **fields: Job fields to update
+        """
+        job = await self.get(job_id) or {"job_id": job_id}
+        job.update(fields)
+        payload = json.dumps(job)
+        await self.redis.set(self._key(job_id), payload, ex=self.ttl)
+        await self.redis.publish(self._channel(job_id), payload)
+
+    async def list_jobs(self) -> List[Dict[str, Any]]:
+        """
+        List all known jobs.
+
+        Returns:
+            List of job states
+        """
+        jobs = []
+        async for key in self.redis.scan_iter(match=f"{self.KEY_PREFIX}*"):
+            raw = await self.redis.get(key)
+            if raw is not None:
+                jobs.append(json.loads(raw))
+        return jobs
+
+    async def watch(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the state of a job each time it changes.
+
+        The current state is yielded first; the stream ends once the job
+        reaches a terminal status.
+
+        Args:
+            job_id: Unique job identifier
+
+        Yields:
+            Job states
+        """
+        pubsub = self.redis.pubsub()
+        # Subscribe before reading the current state so no update is missed
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            job = await self.get(job_id)
+            while job is not None:
+                yield job
+                if job.get("status") in TERMINAL_STATUSES:
+                    break
+                
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                if message is not None:
+                    job = json.loads(message["data"])
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.aclose()
+
+
+def get_job_store():
+    """
+    Create the job store configured for this process.
+
+    Returns:
+        A Redis-backed store if REDIS_URL is set, otherwise an in-memory store
+    """
+    if config.REDIS_URL:
+        return RedisJobStore(config.REDIS_URL)
+    return InMemoryJobStore()
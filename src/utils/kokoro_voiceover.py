@@ -4,34 +4,153 @@ All rights reserved.
 This file is part of the Manim Voiceover project.
 """
 
+import asyncio
+import atexit
+import av
+import functools
 import hashlib
-import json
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 from manim_voiceover.services.base import SpeechService
+import onnxruntime as ort
 from kokoro_onnx import Kokoro
 from manim_voiceover.helper import remove_bookmarks, wav2mp3
 from scipy.io.wavfile import write as write_wav
-from src.config.config import Config
+from src.config.config import config
 from src.core.animation_planner import Scene
+from src.utils.tts_cache import TTSCacheMixin
 
 from src.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Scenes synthesized concurrently by generate_audio_for_scenes
+TTS_WORKERS = 4
 
-class KokoroService(SpeechService):
+# Process-wide pool for synchronous synthesis, shared by every generate_audio_for_scenes call
+_TTS_EXECUTOR = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+atexit.register(_TTS_EXECUTOR.shutdown)
+
+# ONNX Runtime execution providers in order of preference; the CPU provider is always available
+_PREFERRED_PROVIDERS = ("CUDAExecutionProvider", "CoreMLExecutionProvider", "CPUExecutionProvider")
+
+# Process-local results of generate_from_text, checked before the on-disk voiceover cache
+_MEM_CACHE: dict[tuple, tuple[str, dict]] = {}
+
+
+def _hash_input_data(input_data: dict, _sha256=hashlib.sha256, _sorted=sorted, _str=str) -> str:
+    """
+    Hash an input data dictionary into a voiceover cache key.
+    
+    The sorted key/value pairs are hashed directly, NUL-separated, instead of
+    being serialized to JSON first. Builtins are bound as defaults so the hot
+    path only does local lookups.
+    
+    Args:
+        input_data: Dictionary of input data (e.g., text, voice, etc.)
+        
+    Returns:
+        The hex digest of the input data
+    """
+    digest = _sha256()
+    update = digest.update
+    for key in _sorted(input_data):
+        update(key.encode('utf-8'))
+        update(b'\x00')
+        update(_str(input_data[key]).encode('utf-8'))
+        update(b'\x00')
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_kokoro(model_path: str, voices_path: str) -> Kokoro:
+    """
+    Load the Kokoro model once and share it between speech services.
+    
+    ONNX Runtime sessions are safe to run from several threads, so the shared
+    session's thread pools are split between the TTS workers rather than each
+    one claiming every core. A GPU execution provider is used when available.
+    
+    Args:
+        model_path: Path to the Kokoro ONNX model
+        voices_path: Path to the Kokoro voices file
+        
+    Returns:
+        The shared Kokoro instance
+    """
+    if not hasattr(Kokoro, "from_session"):
+        return Kokoro(model_path, voices_path)
+    
+    sess_options = ort.SessionOptions()
+    sess_options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // TTS_WORKERS)
+    sess_options.inter_op_num_threads = 1
+    available = set(ort.get_available_providers())
+    providers = [provider for provider in _PREFERRED_PROVIDERS if provider in available]
+    session = ort.InferenceSession(model_path, sess_options, providers=providers)
+    logger.info(f"Kokoro session using providers: {session.get_providers()}")
+    return Kokoro.from_session(session, voices_path)
+
+
+def write_mp3(output_file: str, pcm: np.ndarray, sample_rate: int) -> str:
+    """
+    Encode mono 16-bit PCM samples straight to an MP3 file.
+    
+    Args:
+        output_file: Path for the MP3 file
+        pcm: Mono int16 samples
+        sample_rate: Sample rate in Hz
+        
+    Returns:
+        Path to the MP3 file
+    """
+    with av.open(output_file, "w") as container:
+        stream = container.add_stream("libmp3lame", rate=sample_rate)
+        stream.codec_context.layout = "mono"
+        
+        frame = av.AudioFrame.from_ndarray(pcm[np.newaxis, :], format="s16p", layout="mono")
+        frame.sample_rate = sample_rate
+        
+        container.mux(stream.encode(frame))
+        container.mux(stream.encode(None))
+    
+    return output_file
+
+
+def quantize_kokoro_model(model_path: str, output_path: str) -> str:
+    """
+    Write an INT8 dynamically quantized copy of the Kokoro model.
+    
+    This is an offline step; point KOKORO_MODEL_PATH at the result to use it.
+    
+    Args:
+        model_path: Path to the FP32 Kokoro ONNX model
+        output_path: Path for the quantized model
+        
+    Returns:
+        Path to the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    quantize_dynamic(model_input=model_path, model_output=output_path, weight_type=QuantType.QInt8)
+    logger.info(f"Quantized Kokoro model saved to {output_path}")
+    return output_path
+
+
+class KokoroService(TTSCacheMixin, SpeechService):
     """Speech service class for kokoro_self (using text_to_speech via Kokoro ONNX)."""
 
     def __init__(self, engine=None, 
-                 model_path: str = Config.KOKORO_MODEL_PATH,
-                 voices_path: str = Config.KOKORO_VOICES_PATH,
-                 voice: str = Config.KOKORO_DEFAULT_VOICE,
-                 speed: float = Config.KOKORO_DEFAULT_SPEED,
-                 lang: str = Config.KOKORO_DEFAULT_LANG,
+                 model_path: str = config.KOKORO_MODEL_PATH,
+                 voices_path: str = config.KOKORO_VOICES_PATH,
+                 voice: str = config.KOKORO_DEFAULT_VOICE,
+                 speed: float = config.KOKORO_DEFAULT_SPEED,
+                 lang: str = config.KOKORO_DEFAULT_LANG,
                  **kwargs):
-        self.kokoro = Kokoro(model_path, voices_path)
+        self.kokoro = _get_kokoro(model_path, voices_path)
+        self.model_path = model_path
         self.voice = voice
         self.speed = speed
         self.lang = lang
@@ -53,10 +172,11 @@ class KokoroService(SpeechService):
         Returns:
             str: The generated hash as a string.
         """
-        # Convert the input data dictionary to a JSON string (sorted for consistency)
-        data_str = json.dumps(input_data, sort_keys=True)
-        # Generate a SHA-256 hash of the JSON string
-        return hashlib.sha256(data_str.encode('utf-8')).hexdigest()
+        return _hash_input_data(input_data)
+
+    def tts_cache_fields(self) -> tuple:
+        """Settings that change the synthesized audio, used for the shared TTS cache."""
+        return ("kokoro_self", os.path.basename(self.model_path or ""), self.voice, self.speed, self.lang)
 
     def text_to_speech(self, text, output_file, voice_name, speed, lang):
         """
@@ -68,16 +188,18 @@ class KokoroService(SpeechService):
             text, voice=voice_name, speed=speed, lang=lang
         )
 
-        # Normalize audio to the range [-1, 1]
-        max_val = np.max(np.abs(samples))
-        if max_val > 0:
-            samples = samples / max_val
-
-        # Convert to 16-bit integer PCM format
-        samples = (samples * 32767).astype("int16")
+        # Normalize audio to the range [-1, 1] and convert to 16-bit integer PCM in one
+        # pass; max/min avoid the temporary array np.abs would allocate
+        max_val = max(float(np.max(samples)), -float(np.min(samples)))
+        scale = 32767.0 / max_val if max_val > 0 else 32767.0
+        pcm = np.empty(np.shape(samples), dtype=np.int16)
+        np.multiply(samples, scale, out=pcm, casting="unsafe")
 
-        # Save the normalized audio as a .wav file
-        write_wav(output_file, sample_rate, samples)
+        # Encode MP3 output directly from memory; otherwise save a .wav file
+        if str(output_file).endswith(".mp3"):
+            write_mp3(output_file, pcm, sample_rate)
+        else:
+            write_wav(output_file, sample_rate, pcm)
         logger.info(f"Audio saved at {output_file}")
 
         return output_file
@@ -90,6 +212,12 @@ class KokoroService(SpeechService):
         # Convert cache_dir to Path object if it's a string
         cache_dir_path = Path(cache_dir) if isinstance(cache_dir, str) else cache_dir
 
+        # Repeat requests in this process skip hashing and the cache metadata scan entirely
+        mem_key = (text, self.voice, self.lang, self.speed, str(cache_dir_path), path)
+        mem_hit = _MEM_CACHE.get(mem_key)
+        if mem_hit is not None and os.path.exists(mem_hit[0]):
+            return dict(mem_hit[1])
+
         input_data = {"input_text": text, "service": "kokoro_self", "voice": self.voice, "lang": self.lang}
         cached_result = self.get_cached_result(input_data, cache_dir_path)
         if cached_result is not None:
@@ -100,30 +228,45 @@ class KokoroService(SpeechService):
         else:
             audio_path = path
 
-        # Generate .wav file using the text_to_speech function
         audio_path_wav = str(Path(cache_dir) / audio_path.replace(".mp3", ".wav"))
-        
-        self.engine(
-            text=text,
-            output_file=audio_path_wav,
-            voice_name=self.voice,
-            speed=self.speed,
-            lang=self.lang,
-        )
-
-        # Convert .wav to .mp3
         mp3_audio_path = str(Path(cache_dir) / audio_path)
-        
-        wav2mp3(audio_path_wav, mp3_audio_path)
 
-        # Remove original .wav file
-        remove_bookmarks(audio_path_wav)
+        def synthesize():
+            if self.engine == self.text_to_speech:
+                # The built-in engine encodes the MP3 directly, with no intermediate .wav
+                self.engine(
+                    text=text,
+                    output_file=mp3_audio_path,
+                    voice_name=self.voice,
+                    speed=self.speed,
+                    lang=self.lang,
+                )
+                return
+            
+            # Generate .wav file using a custom engine
+            self.engine(
+                text=text,
+                output_file=audio_path_wav,
+                voice_name=self.voice,
+                speed=self.speed,
+                lang=self.lang,
+            )
+
+            # Convert .wav to .mp3
+            wav2mp3(audio_path_wav, mp3_audio_path)
+
+            # Remove original .wav file
+            remove_bookmarks(audio_path_wav)
+
+        # Reuse audio synthesized by any earlier run for the same text and voice
+        self.synthesize_cached(text, mp3_audio_path, synthesize)
 
         json_dict = {
             "input_text": text,
             "input_data": input_data,
             "original_audio": audio_path,
         }
+        _MEM_CACHE[mem_key] = (mp3_audio_path, dict(json_dict))
 
         return json_dict
 
@@ -174,65 +317,63 @@ def generate_scene_audio(scene: Scene, output_dir: Path) -> str:
         return None
         
         
-async def generate_audio_for_scenes(scenes: list[Scene], output_dir: Path) -> list[Scene]:
+async def generate_audio_for_scenes(scenes: list[Scene], output_dir: Path,
+                                    queue: Optional[asyncio.Queue] = None) -> list[Scene]:
     """
     Generate audio for all scenes in a video.
     
     Args:
         scenes: List of Scene objects
         output_dir: Directory to save audio files
+        queue: Optional queue that receives an (index, scene) pair as soon as each
+            scene's audio is ready, followed by None once every scene is done
         
     Returns:
-        Updated list of Scene objects with audio_file paths
+        Updated list of Scene objects with audio_file paths, in input order
     """
-    import asyncio
-    from concurrent.futures import ThreadPoolExecutor
+    updated_scenes = list(scenes)
     
-    updated_scenes = []
+    # Run the synchronous audio generation on the shared TTS thread pool
+    loop = asyncio.get_running_loop()
+    pending = {}
     
-    # Create a thread pool for the synchronous audio generation
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        loop = asyncio.get_running_loop()
-        tasks = []
-        
-        for scene in scenes:
-            # Check if scene already has an audio file
-            if scene.audio_file and os.path.exists(scene.audio_file):
-                logger.info(f"Scene {scene.id} already has an audio file, reusing: {scene.audio_file}")
-                updated_scenes.append(scene)
-                continue
-                
-            # Create directory for scene if it doesn't exist
-            scene_dir = os.path.join(str(output_dir), scene.id)
-            os.makedirs(scene_dir, exist_ok=True)
+    for index, scene in enumerate(scenes):
+        # Check if scene already has an audio file
+        if scene.audio_file and os.path.exists(scene.audio_file):
+            logger.info(f"Scene {scene.id} already has an audio file, reusing: {scene.audio_file}")
+            if queue is not None:
+                queue.put_nowait((index, scene))
+            continue
             
-            # Run audio generation in thread pool
-            task = loop.run_in_executor(
-                executor,
-                generate_scene_audio,
-                scene,
-                Path(scene_dir)
-            )
-            tasks.append((scene, task))
+        # Create directory for scene if it doesn't exist
+        scene_dir = os.path.join(str(output_dir), scene.id)
+        os.makedirs(scene_dir, exist_ok=True)
         
-        # Wait for all tasks to complete
-        for scene, task in tasks:
-            audio_file = await task
-            
-            # Update scene with audio file path
-            updated_scene = Scene(
-                id=scene.id,
-                title=scene.title,
-                duration=scene.duration,
-                narration=scene.narration,
-                animation_plan=scene.animation_plan,
-                original_query=scene.original_query,
-                original_solution=scene.original_solution,
-                manim_code=scene.manim_code,
-                audio_file=audio_file,
-                video_file=scene.video_file
-            )
-            
-            updated_scenes.append(updated_scene)
-            
+        # Run audio generation in thread pool
+        future = loop.run_in_executor(
+            _TTS_EXECUTOR,
+            generate_scene_audio,
+            scene,
+            Path(scene_dir)
+        )
+        pending[future] = index
+    
+    # Hand each scene on as soon as its audio is ready
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                
+                # Update scene with audio file path
+                updated_scene = scenes[index].model_copy(update={"audio_file": future.result()})
+                updated_scenes[index] = updated_scene
+                
+                if queue is not None:
+                    queue.put_nowait((index, updated_scene))
+    finally:
+        # Always end the stream so consumers never wait forever
+        if queue is not None:
+            queue.put_nowait(None)
+    
     return updated_scenes
\ No newline at end of file
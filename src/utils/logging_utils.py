@@ -3,7 +3,10 @@ Logging utilities for the Manim Video Generator.
 """
 
 import os
+import atexit
+import queue
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import colorlog
 from concurrent_log_handler import ConcurrentRotatingFileHandler
 from pathlib import Path
@@ -12,29 +15,19 @@ from pathlib import Path
 logs_dir = Path("logs")
 logs_dir.mkdir(exist_ok=True)
 
-# Set up logging configuration
-def get_logger(name, log_level=logging.INFO):
+
+def _create_log_listener(log_queue: queue.SimpleQueue) -> QueueListener:
     """
-    Get a configured logger instance.
+    Create the background listener that writes queued records to the console and log file.
     
     Args:
-        name: Logger name, typically __name__
-        log_level: Logging level
+        log_queue: Queue that every logger's QueueHandler feeds
         
     Returns:
-        Configured logger
+        The (not yet started) queue listener
     """
-    logger = logging.getLogger(name)
-    
-    # Only configure logger once
-    if logger.handlers:
-        return logger
-        
-    logger.setLevel(log_level)
-    
     # Configure console handler with colorful output
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
     
     # Add colors to different log levels
     color_formatter = colorlog.ColoredFormatter(
@@ -49,17 +42,16 @@ def get_logger(name, log_level=logging.INFO):
         }
     )
     console_handler.setFormatter(color_formatter)
-    logger.addHandler(console_handler)
     
-    # Configure file handler with rotating log files
+    # Configure a single rotating log file shared by all loggers. It stays process-safe,
+    # since several API workers may write to it, but only the listener thread ever takes its lock
     file_handler = ConcurrentRotatingFileHandler(
-        filename=logs_dir / f"{name.split('.')[-1]}.log",
+        filename=logs_dir / "app.log",
         mode='a',
         maxBytes=10 * 1024 * 1024,  # 10 MB
         backupCount=5,
         encoding='utf-8'
     )
-    file_handler.setLevel(log_level)
     
     # Use standard formatting for log files (without colors)
     file_formatter = logging.Formatter(
@@ -67,7 +59,38 @@ def get_logger(name, log_level=logging.INFO):
         datefmt="%Y-%m-%d %H:%M:%S"
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    
+    return QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+
+
+# Loggers only enqueue records; one background thread does all console and file I/O
+_LOG_QUEUE = queue.SimpleQueue()
+_QUEUE_HANDLER = QueueHandler(_LOG_QUEUE)
+_LISTENER = _create_log_listener(_LOG_QUEUE)
+_LISTENER.start()
+atexit.register(_LISTENER.stop)
+
+
+# Set up logging configuration
+def get_logger(name, log_level=logging.INFO):
+    """
+    Get a configured logger instance.
+    
+    Args:
+        name: Logger name, typically __name__
+        log_level: Logging level
+        
+    Returns:
+        Configured logger
+    """
+    logger = logging.getLogger(name)
+    
+    # Only configure logger once
+    if logger.handlers:
+        return logger
+        
+    logger.setLevel(log_level)
+    logger.addHandler(_QUEUE_HANDLER)
     
     return logger
 
@@ -0,0 +1,144 @@
+"""
+Persistent Manim render workers.
+
+Each worker process imports Manim once and then renders scene files in-process,
+so scenes no longer pay the interpreter and Manim import cost of a fresh
+``python -m manim`` subprocess. Workers are spawned lazily and reused for the
+lifetime of the application.
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import multiprocessing
+import subprocess
+import sys
+import threading
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.config.config import config
+from src.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _init_worker():
+    """Import Manim once when a worker process starts."""
+    import manim  # noqa: F401
+
+
+def _render(scene_file: str, class_name: str, media_dir: str, output_name: str,
+            draft: bool, frame_rate: int) -> Tuple[bool, str]:
+    """
+    Render a scene inside a worker process.
+
+    Args:
+        scene_file: Path to the Python file containing the scene
+        class_name: Name of the scene class to render
+        media_dir: Media directory for Manim output
+        output_name: File name of the rendered video, without extension
+        draft: Whether to render at Manim's low quality preset
+        frame_rate: Frame rate to render at, ignored for drafts
+
+    Returns:
+        Tuple of (success, output) where output is the movie path or the traceback
+    """
+    import manim
+
+    # A fresh module name per render, so fixed code is never served from a stale import
+    module_name = f"_manim_scene_{uuid.uuid4().hex}"
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, scene_file)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+
+        # tempconfig restores the global Manim config once the render finishes
+        with manim.tempconfig({}):
+            if draft:
+                manim.config.quality = "low_quality"
+            else:
+                manim.config.quality = "high_quality"
+                manim.config.frame_rate = frame_rate
+            manim.config.media_dir = media_dir
+            manim.config.input_file = scene_file
+            manim.config.output_file = output_name
+            manim.config.preview = False
+            manim.config.disable_caching = True
+
+            scene = getattr(module, class_name)()
+            scene.render()
+            return True, str(scene.renderer.file_writer.movie_file_path)
+    except BaseException:
+        return False, traceback.format_exc()
+    finally:
+        sys.modules.pop(module_name, None)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Get the shared worker pool, starting it on first use.
+
+    Returns:
+        The process pool of Manim workers
+    """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                # Spawned rather than forked, so workers never inherit the event loop or logging threads
+                _EXECUTOR = ProcessPoolExecutor(
+                    max_workers=config.MAX_PARALLEL_RENDERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+                atexit.register(_EXECUTOR.shutdown)
+                logger.info(f"Started {config.MAX_PARALLEL_RENDERS} persistent Manim workers")
+    return _EXECUTOR
+
+
+async def render_in_worker(scene_file: Path, class_name: str, media_dir: Path,
+                           output_name: str, draft: bool = False) -> subprocess.CompletedProcess:
+    """
+    Render a scene in a persistent worker process.
+
+    Mirrors run_command so callers can swap one for the other: failures raise
+    CalledProcessError with the traceback as stderr.
+
+    Args:
+        scene_file: Path to the Python file containing the scene
+        class_name: Name of the scene class to render
+        media_dir: Media directory for Manim output
+        output_name: File name of the rendered video, without extension
+        draft: Whether to render a low quality draft
+
+    Returns:
+        A completed process whose stdout names the rendered movie
+
+    Raises:
+        subprocess.CalledProcessError: If the render fails
+    """
+    args = [str(scene_file), class_name]
+    loop = asyncio.get_running_loop()
+    success, output = await loop.run_in_executor(
+        _get_executor(),
+        _render,
+        str(scene_file),
+        class_name,
+        str(media_dir),
+        output_name,
+        draft,
+        config.MANIM_FRAME_RATE
+    )
+
+    if not success:
+        raise subprocess.CalledProcessError(1, args, output="", stderr=output)
+
+    return subprocess.CompletedProcess(args, 0, stdout=f"File ready at {output}", stderr="")
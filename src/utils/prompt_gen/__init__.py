@@ -1,8 +1,41 @@
 import os
+import re
 import json
+import string
 from pathlib import Path
 from typing import Dict, Optional
 
+_DIGITS_RE = re.compile(r'\d+')
+
+# Prompt templates are read once at import rather than on every call
+_PROMPT_DIR = Path(__file__).parent / "prompt"
+_PROMPTS: Dict[str, str] = {}
+with os.scandir(_PROMPT_DIR) as entries:
+    for entry in entries:
+        if entry.name.endswith(".txt") and entry.is_file():
+            with open(entry.path, "r", encoding="utf-8") as f:
+                _PROMPTS[entry.name] = f.read().strip()
+
+# Base prompt; $-placeholders leave the braces in Manim/LaTeX examples untouched
+# (write a literal dollar sign as $$)
+_BASE_TEMPLATE = string.Template((_PROMPT_DIR / "prompt_code_generation.txt").read_text(encoding="utf-8"))
+
+# Reference sections appended to every prompt, in order
+_INTEGRATION_SECTIONS = [
+    ("prompt_manim_cheatsheet.txt", "# Manim Cheatsheet"),
+    ("code_color_cheatsheet.txt", "# Color Cheatsheet"),
+    ("code_limit.txt", "# Frame Dimensions and Limits"),
+    ("code_background.txt", "# Background Information"),
+    ("code_font_size.txt", "# Font Size Guidelines"),
+]
+
+# The reference sections never change, so they are joined once into a constant suffix
+_STATIC_SUFFIX = "\n\n".join(
+    f"{section_title}\n{_PROMPTS[filename]}"
+    for filename, section_title in _INTEGRATION_SECTIONS
+    if filename in _PROMPTS
+)
+
 def generate_code_prompt(
     scene_id: str,
     scene_title: str,
@@ -24,22 +57,14 @@ def generate_code_prompt(
     Returns:
         A string containing the combined and integrated prompts.
     """
-    # Base Prompt
-    template = f""
-    with open(Path(__file__).parent / "prompt" / "prompt_code_generation.txt", 'r') as file:
-        template = file.read()
-    
-    # Pre-process the template to replace json.dumps expression
     animation_plan_json = json.dumps(animation_plan, indent=2)
-    template = template.replace('{json.dumps(animation_plan, indent=2)}', '{animation_plan_json}')
     
     # Extract scene number from scene_id (assuming scene_id format like "scene1", "scene2", etc.)
-    scene_number = ''.join(filter(str.isdigit, scene_id))
-    if not scene_number:
-        scene_number = "1"  # Default to 1 if no number is found
+    match = _DIGITS_RE.search(scene_id)
+    scene_number = match.group(0) if match else "1"  # Default to 1 if no number is found
         
     # Format the template with the provided values
-    combined_prompt = template.format(
+    combined_prompt = _BASE_TEMPLATE.substitute(
         scene_id=scene_id, 
         scene_title=scene_title,
         scene_number=scene_number,
@@ -47,31 +72,12 @@ def generate_code_prompt(
         animation_plan_json=animation_plan_json
     )
 
-    # Directory containing additional prompt files
-    prompt_dir = Path(__file__).parent / "prompt"
-    prompts: Dict[str, str] = {}
-
-    # Load additional prompts
-    for file_path in prompt_dir.glob("*.txt"):
-        with open(file_path, "r", encoding="utf-8") as f:
-            prompts[file_path.name] = f.read().strip()
-
     # Integrate additional prompts meaningfully
-    integration_sections = [
-        ("prompt_manim_cheatsheet.txt", "# Manim Cheatsheet"),
-        ("code_color_cheatsheet.txt", "# Color Cheatsheet"),
-        ("code_limit.txt", "# Frame Dimensions and Limits"),
-        ("code_background.txt", "# Background Information"),
-        ("code_font_size.txt", "# Font Size Guidelines"),
-    ]
-
-    for filename, section_title in integration_sections:
-        if filename in prompts:
-            combined_prompt += f"\n\n{section_title}\n{prompts[filename]}"
+    parts = [combined_prompt, _STATIC_SUFFIX]
 
     # Context Learning Examples Integration
-    if "prompt_context_learning_code.txt" in prompts and context_examples:
-        context_prompt = prompts["prompt_context_learning_code.txt"].replace("{examples}", context_examples)
-        combined_prompt += f"\n\n# Example Code\n{context_prompt}"
+    if "prompt_context_learning_code.txt" in _PROMPTS and context_examples:
+        context_prompt = _PROMPTS["prompt_context_learning_code.txt"].replace("{examples}", context_examples)
+        parts.append(f"# Example Code\n{context_prompt}")
 
-    return combined_prompt.strip()
+    return "\n\n".join(parts).strip()
@@ -0,0 +1,140 @@
+"""
+Persistent, content-addressed cache for rendered Manim videos.
+
+Rendered videos are stored by a hash of the scene code and render settings,
+so unchanged scenes are not rendered again. The cache is kept under a byte
+budget by evicting the least recently used videos.
+"""
+
+import os
+import hashlib
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from src.config.config import config
+from src.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def link_or_copy(src: str, dst: str) -> None:
+    """
+    Place a file at dst by hard-linking it, copying only across filesystems.
+    
+    The file is published with an atomic rename, replacing any existing dst.
+    Callers must not modify either file in place afterwards, since a link
+    shares its data with the source.
+    
+    Args:
+        src: Path to the existing file
+        dst: Destination path
+    """
+    temp_path = f"{dst}.{os.getpid()}.tmp"
+    try:
+        os.link(src, temp_path)
+    except OSError:
+        shutil.copyfile(src, temp_path)
+    os.replace(temp_path, dst)
+
+
+class RenderCache:
+    """
+    LRU-evicted on-disk cache of rendered videos keyed by scene code.
+    """
+    
+    def __init__(self, cache_dir: str = config.RENDER_CACHE_DIR,
+                 max_bytes: int = config.RENDER_CACHE_MAX_BYTES):
+        """
+        Initialize the render cache.
+        
+        Args:
+            cache_dir: Directory holding cached videos
+            max_bytes: Total size the cache is trimmed to after each insert
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+    
+    @staticmethod
+    def key(code: str, *settings: str) -> str:
+        """
+        Build the cache key for scene code rendered with the given settings.
+        
+        Args:
+            code: Manim scene code
+            *settings: Render settings that change the output (quality flags, class name, ...)
+            
+        Returns:
+            Hex SHA-256 digest identifying the render
+        """
+        digest = hashlib.sha256(code.encode("utf-8"))
+        for setting in settings:
+            digest.update(b"\0" + str(setting).encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp4"
+    
+    def get(self, key: str) -> Optional[Path]:
+        """
+        Look up a cached render.
+        
+        Args:
+            key: Cache key from key()
+            
+        Returns:
+            Path to the cached video, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            # Refresh the access time explicitly; many filesystems mount with noatime/relatime
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        
+        logger.info(f"Render cache hit: {key[:12]}")
+        return path
+    
+    def put(self, key: str, video_file: str) -> Path:
+        """
+        Store a rendered video in the cache.
+        
+        Args:
+            key: Cache key from key()
+            video_file: Path to the rendered video
+            
+        Returns:
+            Path to the cached copy
+        """
+        path = self._path(key)
+        
+        # Published atomically so concurrent readers never see a partial file
+        link_or_copy(video_file, str(path))
+        
+        self.evict()
+        return path
+    
+    def evict(self):
+        """Delete least recently used videos until the cache fits its byte budget."""
+        entries = []
+        total_bytes = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".mp4") and entry.is_file():
+                    stat_result = entry.stat()
+                    entries.append((stat_result.st_atime, stat_result.st_size, entry.path))
+                    total_bytes += stat_result.st_size
+        
+        if total_bytes <= self.max_bytes:
+            return
+        
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total_bytes -= size
+            logger.info(f"Evicted cached render: {os.path.basename(path)}")
+            if total_bytes <= self.max_bytes:
+                break
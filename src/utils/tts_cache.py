@@ -0,0 +1,101 @@
+"""
+Persistent, content-addressed cache for synthesized voiceover audio.
+
+Audio is stored once per distinct (text, voice settings) combination under a
+sharded directory tree shared by every run, so re-rendering a video or
+repeating a phrase does not run TTS inference again.
+"""
+
+import os
+import hashlib
+import shutil
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked access
+    fcntl = None
+
+from src.config.config import config
+from src.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class TTSCacheMixin(ABC):
+    """
+    Mixin adding a shared on-disk audio cache to a speech service.
+    
+    The service must implement ``tts_cache_fields()`` returning the settings
+    that affect the synthesized audio (voice, speed, language, model, ...).
+    """
+    
+    tts_cache_dir: Path = Path(config.TTS_CACHE_DIR).expanduser()
+    
+    @abstractmethod
+    def tts_cache_fields(self) -> tuple:
+        """Return the service settings that affect synthesized audio."""
+    
+    def tts_cache_key(self, text: str) -> str:
+        """
+        Build the cache key for a text under the current service settings.
+        
+        Args:
+            text: Text to synthesize
+            
+        Returns:
+            Hex SHA-256 digest identifying the audio
+        """
+        fields = "|".join(str(field) for field in self.tts_cache_fields())
+        return hashlib.sha256(f"{fields}|{text}".encode("utf-8")).hexdigest()
+    
+    def _tts_cache_path(self, key: str, suffix: str) -> Path:
+        return self.tts_cache_dir / key[:2] / f"{key}{suffix}"
+    
+    @contextmanager
+    def _tts_cache_lock(self, cache_path: Path):
+        """Hold an exclusive lock on a cache entry's sidecar lock file."""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path.with_name(cache_path.name + ".lock"), "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def synthesize_cached(self, text: str, output_path: str, synthesize: Callable[[], None]) -> bool:
+        """
+        Produce the audio for a text at output_path, using the cache if possible.
+        
+        Concurrent callers synthesizing the same text wait on the entry's lock
+        instead of running inference twice.
+        
+        Args:
+            text: Text to synthesize
+            output_path: Where the audio file should end up
+            synthesize: Callable that writes freshly synthesized audio to output_path
+            
+        Returns:
+            True if the audio came from the cache, False if it was synthesized
+        """
+        key = self.tts_cache_key(text)
+        cache_path = self._tts_cache_path(key, Path(output_path).suffix)
+        
+        with self._tts_cache_lock(cache_path):
+            if cache_path.exists():
+                shutil.copyfile(cache_path, output_path)
+                logger.info(f"Using cached voiceover {key[:12]} for {output_path}")
+                return True
+            
+            synthesize()
+            
+            # Publish atomically so readers never see a partial file
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            shutil.copyfile(output_path, temp_path)
+            os.replace(temp_path, cache_path)
+            return False
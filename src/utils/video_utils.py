@@ -3,21 +3,345 @@ Video utilities for generating and combining Manim animations.
 """
 
 import os
+import ast
+import py_compile
+import asyncio
+import contextlib
+import functools
+import hashlib
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
 import json
 import re
 from typing import List, Dict, Any, Optional
 import shutil
+from importlib import metadata
 
-from moviepy.editor import VideoFileClip, AudioFileClip, concatenate_videoclips
-
+from src.config.config import config
 from src.core.animation_planner import Scene
+from src.utils.render_cache import RenderCache, link_or_copy
+from src.utils.manim_worker import render_in_worker
 from src.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Manim names its output directory after the resolution and frame rate
+MANIM_QUALITY_DIR = f"1080p{config.MANIM_FRAME_RATE}"
+
+# Draft renders (-ql at Manim's default 15 fps) only check that retried code runs
+MANIM_DRAFT_QUALITY_DIR = "480p15"
+
+# Part of every render cache key, so upgrading Manim invalidates old renders
+try:
+    MANIM_VERSION = metadata.version("manim")
+except metadata.PackageNotFoundError:
+    MANIM_VERSION = "unknown"
+
+# Renders shared across runs, keyed by scene code and render settings
+_RENDER_CACHE = RenderCache()
+
+# Bytecode for scene files lives outside the output tree, in memory-backed storage when available
+MANIM_PYCACHE_DIR = os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+    "manim-video-agent-pyc"
+)
+
+# Trailing subprocess output kept per stream for logs and AI fixes
+_OUTPUT_TAIL_BYTES = 64 * 1024
+
+_CLASS_RE = re.compile(r"class\s+(\w+)\((Voice\w*Scene|Scene)\)")
+_CODE_TAG_RE = re.compile(r'<CODE>\n?(.*?)\n?</CODE>', re.DOTALL)
+_NUMLIST_RE = re.compile(r'^\d+\.')
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Writes a text file unless it already holds exactly this content.
+    
+    Leaving unchanged files alone keeps their mtime, so anything keyed on it
+    stays valid across retries and pipeline reruns.
+    
+    Args:
+        path: Path to the file
+        content: Text to write
+        
+    Returns:
+        True if the file was written
+    """
+    try:
+        if path.read_text() == content:
+            return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    
+    path.write_text(content)
+    return True
+
+
+def render_output_name(scene_file: Path, draft: bool = False) -> str:
+    """
+    Gets the file name Manim is told to write a scene's video to.
+    
+    Args:
+        scene_file: Path to the Python file containing the scene
+        draft: Whether this is a low quality draft render
+        
+    Returns:
+        Output file name without extension
+    """
+    return f"{scene_file.stem}_{'draft' if draft else 'render'}"
+
+
+def find_rendered_video(scene_file: Path, output_dir: Path, draft: bool = False) -> Optional[Path]:
+    """
+    Finds the video Manim rendered for a scene file.
+    
+    Manim writes to a known path because the output file name is fixed on
+    the command line; the media directory is only searched if that misses.
+    
+    Args:
+        scene_file: Path to the Python file containing the scene
+        output_dir: Media directory for Manim output
+        draft: Whether to look for a low quality draft render
+        
+    Returns:
+        Path to the rendered video, or None if it was not found
+    """
+    output_name = render_output_name(scene_file, draft)
+    quality_dir = MANIM_DRAFT_QUALITY_DIR if draft else MANIM_QUALITY_DIR
+    expected_path = output_dir / "videos" / scene_file.stem / quality_dir / f"{output_name}.mp4"
+    if expected_path.exists():
+        return expected_path
+    
+    matches = list(output_dir.rglob(f"{output_name}.mp4"))
+    return max(matches, key=os.path.getmtime) if matches else None
+
+
+def build_manim_command(scene_file: Path, class_name: str, output_dir: Path, draft: bool = False) -> List[str]:
+    """
+    Builds the Manim command line used to render a scene.
+    
+    Renders at 1080p with the configured frame rate and without opening a
+    preview player, since videos are post-processed rather than watched.
+    Draft renders use Manim's low quality preset instead. The output file
+    name is fixed so find_rendered_video knows where to look.
+    
+    Manim's partial movie cache is disabled; it slows down large scenes,
+    and whole renders are already cached by code hash.
+    
+    Args:
+        scene_file: Path to the Python file containing the scene
+        class_name: Name of the scene class to render
+        output_dir: Media directory for Manim output
+        draft: Whether to render a low quality draft (480p15)
+        
+    Returns:
+        Command as a list of arguments
+    """
+    if draft:
+        quality_args = ["-ql"]  # Low quality (480p15)
+    else:
+        quality_args = [
+            "-qh",  # High quality (1080p)
+            f"--frame_rate={config.MANIM_FRAME_RATE}",
+        ]
+    
+    return [
+        "python", "-m", "manim",
+        *quality_args,
+        "--disable_caching",  # Whole renders are cached by RenderCache instead
+        str(scene_file),
+        class_name,
+        f"--media_dir={output_dir}",
+        f"--output_file={render_output_name(scene_file, draft)}"
+    ]
+
+
+def use_pidfd_child_watcher() -> bool:
+    """
+    Reaps asyncio subprocesses through pidfds instead of a waitpid thread per child.
+    
+    Must be called before the event loop is created. Only applies on Linux
+    with Python before 3.12, which picks the pidfd watcher by itself.
+    
+    Returns:
+        True if the pidfd watcher was installed
+    """
+    if sys.platform != "linux" or sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return False
+    
+    try:
+        # Probe once, since pidfd_open needs Linux 5.3 or newer
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return False
+    
+    asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+    return True
+
+
+async def _read_tail(stream: asyncio.StreamReader, limit: int = None) -> str:
+    """
+    Reads a stream to the end, keeping only its last bytes.
+    
+    Args:
+        stream: Stream to drain
+        limit: Number of trailing bytes to keep (defaults to _OUTPUT_TAIL_BYTES)
+        
+    Returns:
+        The decoded tail, prefixed with "..." if earlier output was dropped
+    """
+    limit = limit or _OUTPUT_TAIL_BYTES
+    tail = bytearray()
+    truncated = False
+    
+    while chunk := await stream.read(65536):
+        tail += chunk
+        if len(tail) > limit:
+            del tail[:-limit]
+            truncated = True
+    
+    text = tail.decode(errors="replace")
+    return f"...{text}" if truncated else text
+
+
+async def run_command(cmd: List[str], env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+    """
+    Runs a command without blocking the event loop and captures its output.
+    
+    Output is streamed rather than buffered whole, and only the last
+    _OUTPUT_TAIL_BYTES of each stream are kept; that tail holds the traceback
+    the AI fix needs, however verbose a long render's log is.
+    
+    Args:
+        cmd: Command as a list of arguments
+        env: Optional environment for the command (defaults to this process's)
+        
+    Returns:
+        The completed process with decoded stdout and stderr
+        
+    Raises:
+        subprocess.CalledProcessError: If the command exits with a non-zero status
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env
+    )
+    try:
+        stdout, stderr = await asyncio.gather(_read_tail(proc.stdout), _read_tail(proc.stderr))
+        await proc.wait()
+    except asyncio.CancelledError:
+        # Don't leave the child running when the scene it belongs to is abandoned
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+    
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout=stdout, stderr=stderr)
+
+
+def manim_subprocess_env() -> dict:
+    """
+    Builds the environment for a Manim subprocess.
+    
+    Built per launch rather than at import, so later changes to os.environ
+    reach the child. Bytecode is read from and written to MANIM_PYCACHE_DIR.
+    
+    Returns:
+        The environment mapping for the subprocess
+    """
+    env = {**os.environ, "PYTHONPYCACHEPREFIX": MANIM_PYCACHE_DIR}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def check_scene_syntax(scene_file: Path) -> None:
+    """
+    Compiles a scene file in memory to reject syntax errors before rendering.
+    
+    Args:
+        scene_file: Path to the Python file containing the scene
+        
+    Raises:
+        SyntaxError: If the scene has a syntax error
+    """
+    with open(scene_file, 'rb') as f:
+        source = f.read()
+    compile(source, str(scene_file), "exec")
+
+
+def precompile_scene(scene_file: Path) -> None:
+    """
+    Byte-compiles a scene file into the shared bytecode cache.
+    
+    The file is written where a Manim subprocess started with
+    manim_subprocess_env() looks for it, so the child skips compiling the scene,
+    and code with syntax errors is rejected without starting Manim at all.
+    
+    Args:
+        scene_file: Path to the Python file containing the scene
+        
+    Raises:
+        py_compile.PyCompileError: If the scene has a syntax error
+    """
+    # Mirrors importlib's mapping of a source path under sys.pycache_prefix
+    source_dir, source_name = os.path.split(os.path.abspath(scene_file))
+    cache_file = os.path.join(
+        MANIM_PYCACHE_DIR,
+        source_dir.lstrip(os.sep),
+        f"{os.path.splitext(source_name)[0]}.{sys.implementation.cache_tag}.pyc"
+    )
+    py_compile.compile(str(scene_file), cfile=cache_file, doraise=True)
+
+
+async def render_scene(scene_file: Path, class_name: str, output_dir: Path,
+                       draft: bool = False) -> subprocess.CompletedProcess:
+    """
+    Renders a scene file with Manim.
+    
+    Uses the persistent Manim workers when MANIM_PERSISTENT_WORKERS is enabled,
+    otherwise a fresh Manim subprocess. The scene is compiled first, off the
+    event loop, so syntax errors fail fast with the compiler's message. Only
+    the subprocess path writes bytecode, since workers import the scene under
+    a fresh module name and never read it.
+    
+    Args:
+        scene_file: Path to the Python file containing the scene
+        class_name: Name of the scene class to render
+        output_dir: Media directory for Manim output
+        draft: Whether to render a low quality draft
+        
+    Returns:
+        The completed render
+        
+    Raises:
+        subprocess.CalledProcessError: If the render fails
+    """
+    if config.MANIM_PERSISTENT_WORKERS:
+        try:
+            await asyncio.to_thread(check_scene_syntax, scene_file)
+        except SyntaxError as e:
+            raise subprocess.CalledProcessError(1, [str(scene_file)], output="", stderr=str(e))
+        
+        logger.info(f"Rendering {class_name} from {scene_file} in a persistent worker")
+        return await render_in_worker(scene_file, class_name, output_dir, render_output_name(scene_file, draft), draft)
+    
+    try:
+        await asyncio.to_thread(precompile_scene, scene_file)
+    except py_compile.PyCompileError as e:
+        raise subprocess.CalledProcessError(1, [str(scene_file)], output="", stderr=e.msg)
+    
+    cmd = build_manim_command(scene_file, class_name, output_dir, draft)
+    logger.info(f"Running command: {' '.join(cmd)}")
+    return await run_command(cmd, env=manim_subprocess_env())
+
 
 async def run_manim_scene(scene: Scene, output_dir: Path, ai_manager=None, max_retries: int = None) -> str:
     """
@@ -37,7 +361,7 @@ async def run_manim_scene(scene: Scene, output_dir: Path, ai_manager=None, max_r
     # Skip if no Manim code is provided
     if not scene.manim_code:
         logger.warning(f"No Manim code provided for scene {scene.id}, using simple placeholder")
-        return generate_placeholder_video(scene, output_dir)
+        return await generate_placeholder_video(scene, output_dir)
     
     # Create a temporary Python file with the scene code
     scene_file = output_dir / f"{scene.id}.py"
@@ -45,7 +369,7 @@ async def run_manim_scene(scene: Scene, output_dir: Path, ai_manager=None, max_r
     # Extract class name from the original manim code
     class_name = None
     if scene.manim_code:
-        class_match = re.search(r"class\s+(\w+)\((Voice\w*Scene|Scene)\)", scene.manim_code)
+        class_match = _CLASS_RE.search(scene.manim_code)
         if class_match:
             class_name = class_match.group(1)
     
@@ -68,51 +392,46 @@ async def run_manim_scene(scene: Scene, output_dir: Path, ai_manager=None, max_r
         scene_code = scene.manim_code
     
     # Write the scene code to the file
-    with open(scene_file, "w") as f:
-        f.write(scene_code)
+    write_if_changed(scene_file, scene_code)
     
-    # Track the number of attempts
+    # Track the number of attempts and the code already tried
     attempts = 0
     current_code = scene_code
+    seen_hashes = {hashlib.sha256(current_code.encode("utf-8")).hexdigest()}
     
     # Attempt to run the code, with potential fixes from AI
     while max_retries is None or attempts <= max_retries:
         attempts += 1
         
+        # Reuse an earlier render of identical code instead of running Manim again
+        output_video = output_dir / f"{scene.id}_video.mp4"
+        cache_key = RenderCache.key(current_code, class_name, "-qh", config.MANIM_FRAME_RATE, MANIM_VERSION)
+        cached_video = _RENDER_CACHE.get(cache_key)
+        if cached_video is not None:
+            link_or_copy(cached_video, output_video)
+            logger.info(f"Reused cached render for scene {scene.id}: {output_video}")
+            return str(output_video)
+        
         try:
-            # Run manim with the scene class
-            cmd = [
-                "python", "-m", "manim",
-                "-pqh",  # Preview quality high
-                str(scene_file),
-                class_name,
-                f"--media_dir={output_dir}"
-            ]
-            
-            logger.info(f"Running command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            # Retried code is first checked with a cheap draft render, and only
+            # rendered at full quality once it works
+            draft = attempts > 1
+            result = await render_scene(scene_file, class_name, output_dir, draft=draft)
+            if draft and find_rendered_video(scene_file, output_dir, draft=True) is not None:
+                logger.info(f"Draft render succeeded for scene {scene.id}, rendering at full quality")
+                result = await render_scene(scene_file, class_name, output_dir)
             
-            # Try to find the video in various locations where Manim might have saved it
-            # Check in videos/<scene_id>/1080p60/
-            possible_paths = [
-                output_dir / "videos" / scene.id / "1080p60" / f"{class_name}.mp4",
-                output_dir / "videos" / f"{scene.id}" / f"{class_name}.mp4",
-                output_dir / "videos" / f"{class_name}.mp4",
-                output_dir / "media" / "videos" / scene.id / "1080p60" / f"{class_name}.mp4",
-                output_dir / "media" / "videos" / f"{scene.id}" / f"{class_name}.mp4",
-                output_dir / "media" / "videos" / f"{class_name}.mp4"
-            ]
-            
-            for path in possible_paths:
-                if path.exists():
-                    logger.info(f"Found video file: {path}")
-                    
-                    # Copy video to a standard location for easier syncing later
-                    output_video = output_dir / f"{scene.id}_video.mp4"
-                    shutil.copy(path, output_video)
-                    logger.info(f"Copied video to {output_video}")
-                    
-                    return str(output_video)
+            path = find_rendered_video(scene_file, output_dir)
+            if path is not None:
+                logger.info(f"Found video file: {path}")
+                
+                # Move video to a standard location for easier syncing later
+                # Manim rewrites this path in place on the next render, so move rather than link it
+                shutil.move(path, output_video)
+                logger.info(f"Moved video to {output_video}")
+                _RENDER_CACHE.put(cache_key, str(output_video))
+                
+                return str(output_video)
             
             logger.error(f"Could not find generated video for scene: {scene.id}")
             logger.error(f"Manim output: {result.stdout}")
@@ -137,14 +456,20 @@ async def run_manim_scene(scene: Scene, output_dir: Path, ai_manager=None, max_r
                 )
                 
                 if fixed_code:
+                    # Rendering code that has already failed would only fail again
+                    fixed_hash = hashlib.sha256(fixed_code.encode("utf-8")).hexdigest()
+                    if fixed_hash in seen_hashes:
+                        logger.warning(f"AI fix for scene {scene.id} repeats code that already failed, using placeholder")
+                        return await generate_placeholder_video(scene, output_dir)
+                    seen_hashes.add(fixed_hash)
+                    
                     logger.info(f"AI provided a fix for scene {scene.id}, retrying")
                     current_code = fixed_code
-                    with open(scene_file, "w") as f:
-                        f.write(fixed_code)
+                    write_if_changed(scene_file, fixed_code)
                     continue
             
             # If no AI manager or AI couldn't fix, return placeholder
-            return generate_placeholder_video(scene, output_dir)
+            return await generate_placeholder_video(scene, output_dir)
                 
         except subprocess.CalledProcessError as e:
             logger.error(f"Error running Manim for scene {scene.id}: {e}")
@@ -171,21 +496,27 @@ async def run_manim_scene(scene: Scene, output_dir: Path, ai_manager=None, max_r
                 )
                 
                 if fixed_code:
+                    # Rendering code that has already failed would only fail again
+                    fixed_hash = hashlib.sha256(fixed_code.encode("utf-8")).hexdigest()
+                    if fixed_hash in seen_hashes:
+                        logger.warning(f"AI fix for scene {scene.id} repeats code that already failed, using placeholder")
+                        return await generate_placeholder_video(scene, output_dir)
+                    seen_hashes.add(fixed_hash)
+                    
                     logger.info(f"AI provided a fix for scene {scene.id}, retrying")
                     current_code = fixed_code
-                    with open(scene_file, "w") as f:
-                        f.write(fixed_code)
+                    write_if_changed(scene_file, fixed_code)
                     continue
             
             # If no AI manager or AI couldn't fix, return placeholder
-            return generate_placeholder_video(scene, output_dir)
+            return await generate_placeholder_video(scene, output_dir)
     
     # If we've exhausted all retries, use a placeholder
     logger.warning(f"Maximum retry attempts ({max_retries}) reached for scene {scene.id}, using placeholder")
-    return generate_placeholder_video(scene, output_dir)
+    return await generate_placeholder_video(scene, output_dir)
 
 
-def generate_placeholder_video(scene: Scene, output_dir: Path) -> str:
+async def generate_placeholder_video(scene: Scene, output_dir: Path) -> str:
     """
     Generates a simple placeholder video for a scene when Manim code fails to run.
     
@@ -226,37 +557,18 @@ class {class_name}(Scene):
 """
     
     # Write the simple scene code to the file
-    with open(scene_file, "w") as f:
-        f.write(simple_code)
+    write_if_changed(scene_file, simple_code)
     
     # Run Manim command to generate the video
     try:
-        cmd = [
-            "python", "-m", "manim",
-            "-pqh",  # Preview quality high
-            str(scene_file),
-            class_name,
-            f"--media_dir={output_dir}"
-        ]
+        logger.info(f"Rendering placeholder scene for {scene_id}")
+        await render_scene(scene_file, class_name, output_dir)
         
-        logger.info(f"Running placeholder command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        
-        # Try to find the video in various locations
-        possible_paths = [
-            output_dir / "videos" / f"{scene_id}_placeholder" / "1080p60" / f"{class_name}.mp4",
-            output_dir / "videos" / f"{scene_id}_placeholder" / f"{class_name}.mp4",
-            output_dir / "videos" / f"{class_name}.mp4",
-            output_dir / "media" / "videos" / f"{scene_id}_placeholder" / "1080p60" / f"{class_name}.mp4",
-            output_dir / "media" / "videos" / f"{scene_id}_placeholder" / f"{class_name}.mp4",
-            output_dir / "media" / "videos" / f"{class_name}.mp4"
-        ]
-        
-        for path in possible_paths:
-            if path.exists():
-                output_video = output_dir / f"{scene_id}_video.mp4"
-                shutil.copy(path, output_video)
-                return str(output_video)
+        path = find_rendered_video(scene_file, output_dir)
+        if path is not None:
+            output_video = output_dir / f"{scene_id}_video.mp4"
+            shutil.move(path, output_video)
+            return str(output_video)
         
         logger.error(f"Could not find generated placeholder video for scene: {scene_id}")
         return None
@@ -266,10 +578,33 @@ class {class_name}(Scene):
         return None
 
 
+@functools.lru_cache(maxsize=1024)
+def _probe_media_duration(file_path: str, mtime_ns: int, size: int) -> float:
+    """
+    Probe the duration of a media file version; the stat fields only key the cache.
+    
+    Args:
+        file_path: Path to the media file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
+        
+    Returns:
+        Duration in seconds
+    """
+    # ffprobe only reads the container header instead of opening a decoder
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", file_path],
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout)
+
+
 def get_media_duration(file_path: str) -> float:
     """
     Get the duration of a media file in seconds.
     
+    Results are cached until the file's modification time or size changes.
+    
     Args:
         file_path: Path to the media file
         
@@ -277,21 +612,14 @@ def get_media_duration(file_path: str) -> float:
         Duration in seconds
     """
     try:
-        if file_path.endswith(".mp4") or file_path.endswith(".mov"):
-            with VideoFileClip(file_path) as clip:
-                return clip.duration
-        elif file_path.endswith(".mp3") or file_path.endswith(".wav"):
-            with AudioFileClip(file_path) as clip:
-                return clip.duration
-        else:
-            logger.warning(f"Unsupported file format: {file_path}")
-            return 0
+        stat_result = os.stat(file_path)
+        return _probe_media_duration(file_path, stat_result.st_mtime_ns, stat_result.st_size)
     except Exception as e:
         logger.error(f"Error getting duration of {file_path}: {e}")
         return 0
 
 
-def sync_video_with_audio(video_file: str, audio_file: str, output_file: str) -> str:
+async def sync_video_with_audio(video_file: str, audio_file: str, output_file: str) -> str:
     """
     Sync a video with audio, ensuring the video lasts as long as the audio.
     If the video is shorter, the last frame will be extended.
@@ -308,34 +636,92 @@ def sync_video_with_audio(video_file: str, audio_file: str, output_file: str) ->
     logger.info(f"Syncing video {video_file} with audio {audio_file}")
     
     try:
-        with VideoFileClip(video_file) as video, AudioFileClip(audio_file) as audio:
-            video_duration = video.duration
-            audio_duration = audio.duration
-            
-            # If audio is longer, extend the video by freezing the last frame
-            if audio_duration > video_duration:
-                logger.info(f"Audio ({audio_duration}s) is longer than video ({video_duration}s). Extending video.")
-                extended_video = video.fx(lambda clip: clip.set_duration(audio_duration))
-                final_video = extended_video.set_audio(audio)
-            else:
-                # If video is longer, cut it to match audio duration
-                logger.info(f"Video ({video_duration}s) is longer than audio ({audio_duration}s). Trimming video.")
-                trimmed_video = video.subclip(0, audio_duration)
-                final_video = trimmed_video.set_audio(audio)
-            
-            # Write the final video
-            final_video.write_videofile(output_file, codec="libx264", audio_codec="aac")
-            
-            return output_file
+        video_duration, audio_duration = await asyncio.gather(
+            asyncio.to_thread(get_media_duration, video_file),
+            asyncio.to_thread(get_media_duration, audio_file)
+        )
+        
+        cmd = ["ffmpeg", "-y", "-loglevel", "error", "-i", video_file, "-i", audio_file]
+        
+        # If audio is longer, extend the video by freezing the last frame
+        if audio_duration > video_duration:
+            logger.info(f"Audio ({audio_duration}s) is longer than video ({video_duration}s). Extending video.")
+            cmd += [
+                "-filter_complex", f"[0:v]tpad=stop_mode=clone:stop_duration={audio_duration - video_duration}[v]",
+                "-map", "[v]", "-map", "1:a",
+                "-c:v", "libx264", "-c:a", "aac"
+            ]
+        else:
+            # If video is longer, cut it to match audio duration; the video stream is copied as-is
+            logger.info(f"Video ({video_duration}s) is longer than audio ({audio_duration}s). Trimming video.")
+            cmd += [
+                "-map", "0:v", "-map", "1:a",
+                "-c:v", "copy", "-c:a", "aac",
+                "-t", str(audio_duration)
+            ]
+        
+        # Write the final video
+        await run_command(cmd + [output_file])
+        
+        return output_file
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error syncing video with audio: {e}")
+        logger.error(f"STDERR: {e.stderr}")
+        return None
     except Exception as e:
         logger.error(f"Error syncing video with audio: {e}")
         return None
 
 
+@functools.lru_cache(maxsize=1024)
+def _probe_stream_signature(file_path: str, mtime_ns: int, size: int) -> tuple:
+    """
+    Probe the stream parameters of a media file version; the stat fields only key the cache.
+    
+    Args:
+        file_path: Path to the media file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
+        
+    Returns:
+        Tuple describing each stream's type, codec and format
+    """
+    result = subprocess.run(
+        ["ffprobe", "-v", "error",
+         "-show_entries",
+         "stream=codec_type,codec_name,profile,width,height,r_frame_rate,time_base,pix_fmt,sample_rate,channels",
+         "-of", "json", file_path],
+        capture_output=True, text=True, check=True
+    )
+    streams = json.loads(result.stdout).get("streams", [])
+    return tuple(tuple(sorted(stream.items())) for stream in streams)
+
+
+def get_stream_signature(file_path: str) -> tuple:
+    """
+    Get the stream parameters that must match for files to be concatenated without re-encoding.
+    
+    Results are cached until the file's modification time or size changes.
+    
+    Args:
+        file_path: Path to the media file
+        
+    Returns:
+        Tuple describing each stream's type, codec and format
+    """
+    stat_result = os.stat(file_path)
+    return _probe_stream_signature(file_path, stat_result.st_mtime_ns, stat_result.st_size)
+
+
 def stitch_videos(video_files: List[str], output_file: str) -> str:
     """
     Stitch multiple videos together into a single video.
     
+    Videos with identical stream parameters are joined with the concat demuxer
+    without re-encoding; otherwise they are re-encoded with the concat filter.
+    When re-encoding, inputs without audio get silence for their duration so
+    the narration of the other inputs is kept.
+    
     Args:
         video_files: List of video file paths
         output_file: Path to save the stitched video
@@ -346,137 +732,193 @@ def stitch_videos(video_files: List[str], output_file: str) -> str:
     logger.info(f"Stitching {len(video_files)} videos together")
     
     try:
-        clips = [VideoFileClip(video) for video in video_files]
-        final_clip = concatenate_videoclips(clips)
+        signatures = [get_stream_signature(video) for video in video_files]
         
-        # Write the final video
-        final_clip.write_videofile(output_file, codec="libx264", audio_codec="aac")
-        
-        # Close all clips
-        for clip in clips:
-            clip.close()
-        final_clip.close()
+        if len(set(signatures)) == 1:
+            # Every scene was rendered with the same settings, so the streams can be copied as-is;
+            # the concat list goes to ffmpeg over stdin instead of through a file
+            concat_list = "".join(
+                "file '" + os.path.abspath(video).replace("'", "'\\''") + "'\n" for video in video_files
+            )
+            subprocess.run(
+                ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                 "-protocol_whitelist", "file,pipe", "-i", "pipe:0", "-c", "copy", output_file],
+                input=concat_list, capture_output=True, text=True, check=True
+            )
+        else:
+            logger.info("Scene videos have mismatched stream parameters, re-encoding while stitching")
+            
+            # Inputs without audio, such as placeholders, get silence so the others keep their narration
+            audio_inputs = [
+                any(("codec_type", "audio") in stream for stream in signature)
+                for signature in signatures
+            ]
+            has_audio = any(audio_inputs)
+            silences = []
+            streams = ""
+            for i, video in enumerate(video_files):
+                if not has_audio:
+                    streams += f"[{i}:v:0]"
+                elif audio_inputs[i]:
+                    streams += f"[{i}:v:0][{i}:a:0]"
+                else:
+                    silences.append(f"anullsrc=r=48000:cl=stereo,atrim=duration={get_media_duration(video)}[s{i}]")
+                    streams += f"[{i}:v:0][s{i}]"
+            filter_graph = "".join(f"{silence};" for silence in silences)
+            filter_graph += f"{streams}concat=n={len(video_files)}:v=1:a={int(has_audio)}[v]{'[a]' if has_audio else ''}"
+            
+            cmd = ["ffmpeg", "-y", "-loglevel", "error"]
+            for video in video_files:
+                cmd += ["-i", video]
+            cmd += ["-filter_complex", filter_graph, "-map", "[v]"]
+            if has_audio:
+                cmd += ["-map", "[a]", "-c:a", "aac"]
+            cmd += ["-c:v", "libx264", output_file]
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
         
         logger.info(f"Stitched video saved to: {output_file}")
         return output_file
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error stitching videos: {e}")
+        logger.error(f"STDERR: {e.stderr}")
+        return None
     except Exception as e:
         logger.error(f"Error stitching videos: {e}")
         return None
 
 
-async def process_scene_videos(scenes: List[Scene], output_dir: Path, ai_manager=None, max_retries: int = None) -> List[Scene]:
+async def process_scene_video(scene: Scene, output_dir: Path, ai_manager=None, max_retries: int = None,
+                              render_semaphore: Optional[asyncio.Semaphore] = None,
+                              sync_semaphore: Optional[asyncio.Semaphore] = None) -> Scene:
     """
-    Process all scenes by running Manim code and syncing videos with audio.
+    Process one scene by running its Manim code and syncing the video with its audio.
+    
+    The render slot is released before syncing, so when scenes are processed
+    concurrently the next scene renders while this one's ffmpeg sync runs.
     
     Args:
-        scenes: List of Scene objects
+        scene: Scene object with audio_file set
         output_dir: Directory to save processed videos
         ai_manager: Optional AI manager for fixing code if it fails to run
         max_retries: Maximum number of retries when code fails (None for unlimited)
+        render_semaphore: Optional semaphore bounding concurrent Manim renders
+        sync_semaphore: Optional semaphore bounding concurrent ffmpeg syncs
         
     Returns:
-        Updated list of Scene objects with video_file paths
+        Updated Scene object with the video_file path
     """
-    updated_scenes = []
+    logger.info(f"Processing video for scene: {scene.id}")
     
-    for scene in scenes:
-        logger.info(f"Processing video for scene: {scene.id}")
+    # Skip scenes without audio
+    if not scene.audio_file:
+        logger.warning(f"Scene {scene.id} has no audio file, skipping video processing")
+        return scene
         
-        # Skip scenes without audio
-        if not scene.audio_file:
-            logger.warning(f"Scene {scene.id} has no audio file, skipping video processing")
-            updated_scenes.append(scene)
-            continue
-            
-        # Create scene directory
-        scene_dir = output_dir / scene.id
-        scene_dir.mkdir(exist_ok=True, parents=True)
-        
-        # Check if synced video already exists
-        synced_video_file = str(scene_dir / f"{scene.id}_synced.mp4")
-        if scene.video_file and os.path.exists(scene.video_file):
-            logger.info(f"Video file already exists for scene {scene.id}, reusing: {scene.video_file}")
-            updated_scenes.append(scene)
-            continue
-        elif os.path.exists(synced_video_file):
-            logger.info(f"Synced video file already exists for scene {scene.id}, reusing: {synced_video_file}")
-            updated_scene = Scene(
-                id=scene.id,
-                title=scene.title,
-                duration=scene.duration,
-                narration=scene.narration,
-                animation_plan=scene.animation_plan,
-                original_query=scene.original_query,
-                original_solution=scene.original_solution,
-                manim_code=scene.manim_code,
-                audio_file=scene.audio_file,
-                video_file=synced_video_file
-            )
-            updated_scenes.append(updated_scene)
-            continue
-            
-        # Generate video from Manim
+    # Create scene directory
+    scene_dir = output_dir / scene.id
+    scene_dir.mkdir(exist_ok=True, parents=True)
+    
+    # Check if synced video already exists
+    synced_video_file = str(scene_dir / f"{scene.id}_synced.mp4")
+    if scene.video_file and os.path.exists(scene.video_file):
+        logger.info(f"Video file already exists for scene {scene.id}, reusing: {scene.video_file}")
+        return scene
+    elif os.path.exists(synced_video_file):
+        logger.info(f"Synced video file already exists for scene {scene.id}, reusing: {synced_video_file}")
+        updated_scene = scene.model_copy(update={"video_file": synced_video_file})
+        return updated_scene
+        
+    # Generate video from Manim
+    if render_semaphore is None:
         video_file = await run_manim_scene(scene, scene_dir, ai_manager, max_retries)
+    else:
+        async with render_semaphore:
+            video_file = await run_manim_scene(scene, scene_dir, ai_manager, max_retries)
+    
+    if not video_file:
+        logger.error(f"Failed to generate video for scene {scene.id}")
+        return scene
         
-        if not video_file:
-            logger.error(f"Failed to generate video for scene {scene.id}")
-            updated_scenes.append(scene)
-            continue
-            
-        # Sync video with audio
-        if scene.audio_file and os.path.exists(scene.audio_file):
-            synced_video = sync_video_with_audio(
+    # Sync video with audio
+    if scene.audio_file and os.path.exists(scene.audio_file):
+        async with sync_semaphore or contextlib.nullcontext():
+            synced_video = await sync_video_with_audio(
                 video_file=video_file,
                 audio_file=scene.audio_file,
                 output_file=synced_video_file
             )
-            
-            if not synced_video:
-                logger.error(f"Failed to sync video with audio for scene {scene.id}")
-                updated_scene = Scene(
-                    id=scene.id,
-                    title=scene.title,
-                    duration=scene.duration,
-                    narration=scene.narration,
-                    animation_plan=scene.animation_plan,
-                    original_query=scene.original_query,
-                    original_solution=scene.original_solution,
-                    manim_code=scene.manim_code,
-                    audio_file=scene.audio_file,
-                    video_file=video_file  # Use the unsynced video
-                )
-            else:
-                logger.info(f"Video synced with audio for scene {scene.id}")
-                updated_scene = Scene(
-                    id=scene.id,
-                    title=scene.title,
-                    duration=scene.duration,
-                    narration=scene.narration,
-                    animation_plan=scene.animation_plan,
-                    original_query=scene.original_query,
-                    original_solution=scene.original_solution,
-                    manim_code=scene.manim_code,
-                    audio_file=scene.audio_file,
-                    video_file=synced_video
-                )
+        
+        if not synced_video:
+            logger.error(f"Failed to sync video with audio for scene {scene.id}")
+            updated_scene = scene.model_copy(update={"video_file": video_file})  # Use the unsynced video
         else:
-            logger.warning(f"No audio file for scene {scene.id}, using video without audio")
-            updated_scene = Scene(
-                id=scene.id,
-                title=scene.title,
-                duration=scene.duration,
-                narration=scene.narration,
-                animation_plan=scene.animation_plan,
-                original_query=scene.original_query,
-                original_solution=scene.original_solution,
-                manim_code=scene.manim_code,
-                audio_file=None,
-                video_file=video_file
-            )
-            
-        updated_scenes.append(updated_scene)
+            logger.info(f"Video synced with audio for scene {scene.id}")
+            updated_scene = scene.model_copy(update={"video_file": synced_video})
+    else:
+        logger.warning(f"No audio file for scene {scene.id}, using video without audio")
+        updated_scene = scene.model_copy(update={"audio_file": None, "video_file": video_file})
         
-    return updated_scenes
+    return updated_scene
+
+
+async def process_scene_videos(scenes: List[Scene], output_dir: Path, ai_manager=None, max_retries: int = None) -> List[Scene]:
+    """
+    Process all scenes by running Manim code and syncing videos with audio.
+    
+    Args:
+        scenes: List of Scene objects
+        output_dir: Directory to save processed videos
+        ai_manager: Optional AI manager for fixing code if it fails to run
+        max_retries: Maximum number of retries when code fails (None for unlimited)
+        
+    Returns:
+        Updated list of Scene objects with video_file paths
+    """
+    # Scenes render concurrently, bounded by the configured number of parallel renders,
+    # and each scene's sync overlaps with the following renders
+    render_semaphore = asyncio.Semaphore(config.MAX_PARALLEL_RENDERS)
+    sync_semaphore = asyncio.Semaphore(config.MAX_PARALLEL_FFMPEG)
+    
+    # gather returns results in input order
+    return list(await asyncio.gather(*(
+        process_scene_video(scene, output_dir, ai_manager, max_retries, render_semaphore, sync_semaphore)
+        for scene in scenes
+    )))
+
+
+async def process_scene_videos_from_queue(queue: asyncio.Queue, output_dir: Path, ai_manager=None, max_retries: int = None) -> List[Scene]:
+    """
+    Process scenes as they arrive on a queue, starting each one as soon as its audio is ready.
+    
+    Args:
+        queue: Queue of (index, scene) pairs, terminated by None, as filled by generate_audio_for_scenes
+        output_dir: Directory to save processed videos
+        ai_manager: Optional AI manager for fixing code if it fails to run
+        max_retries: Maximum number of retries when code fails (None for unlimited)
+        
+    Returns:
+        Updated list of Scene objects with video_file paths, in index order
+        
+    Raises:
+        Exception: The first scene error; the remaining scenes are cancelled
+    """
+    render_semaphore = asyncio.Semaphore(config.MAX_PARALLEL_RENDERS)
+    sync_semaphore = asyncio.Semaphore(config.MAX_PARALLEL_FFMPEG)
+    tasks = {}
+    
+    # If any scene fails, the task group cancels the others instead of leaving them running
+    try:
+        async with asyncio.TaskGroup() as tg:
+            while (item := await queue.get()) is not None:
+                index, scene = item
+                tasks[index] = tg.create_task(
+                    process_scene_video(scene, output_dir, ai_manager, max_retries, render_semaphore, sync_semaphore)
+                )
+    except ExceptionGroup as eg:
+        # Surface the actual failure rather than the TaskGroup wrapper
+        raise eg.exceptions[0]
+    
+    return [tasks[index].result() for index in sorted(tasks)]
 
 
 def create_final_video(scenes: List[Scene], output_file: str) -> str:
@@ -508,6 +950,110 @@ def create_final_video(scenes: List[Scene], output_file: str) -> str:
     return stitch_videos(video_files, output_file) 
 
 
+def _parses_with_class(code: str) -> bool:
+    """
+    Checks whether code is valid Python that defines at least one class.
+    
+    Args:
+        code: Python source
+        
+    Returns:
+        True if the code parses and has a top-level class definition
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return False
+    return any(isinstance(node, ast.ClassDef) for node in tree.body)
+
+
+def _largest_parseable_prefix(lines: List[str]) -> Optional[str]:
+    """
+    Finds the longest run of leading lines that parses as a scene module.
+    
+    Prose can only start at a blank line or an unindented line, so only those
+    cut points are tried, longest prefix first. Parseability is not monotonic
+    in the prefix length (a cut inside a multi-line call fails even though a
+    longer prefix parses), so the first prefix that parses is the answer.
+    
+    Args:
+        lines: Lines of the code file
+        
+    Returns:
+        The parseable prefix, or None if no prefix defines a class
+    """
+    for cut in range(len(lines), 0, -1):
+        if cut < len(lines) and lines[cut].strip() and lines[cut][0].isspace():
+            continue
+        prefix = "\n".join(lines[:cut])
+        if _parses_with_class(prefix):
+            return prefix
+    return None
+
+
+@functools.lru_cache(maxsize=128)
+def _clean_code_text(content: str) -> str:
+    """
+    Strips explanatory text and wrappers from generated Manim code.
+    
+    Args:
+        content: Raw contents of a Manim code file
+        
+    Returns:
+        The cleaned code
+    """
+    # Code that already parses needs no cleaning
+    if _parses_with_class(content):
+        return content.strip()
+    
+    # Check for <CODE> tags
+    code_blocks = _CODE_TAG_RE.findall(content)
+    if code_blocks:
+        clean_code = code_blocks[0].strip()
+    # Check for markdown-style code blocks
+    elif "```python" in content and "```" in content:
+        code_parts = content.split("```python")
+        if len(code_parts) > 1:
+            clean_code = code_parts[1].split("```")[0].strip()
+        else:
+            clean_code = content  # Fallback
+    elif (prefix := _largest_parseable_prefix(content.split('\n'))) is not None:
+        # Code followed by explanatory text: keep the part that parses
+        clean_code = prefix.strip()
+    else:
+        # Try to find where explanatory text starts
+        lines = content.split('\n')
+        code_lines = []
+        in_explanatory_text = False
+        
+        for i, line in enumerate(lines):
+            # Skip initial comments that look like explanations
+            if (not code_lines and 
+                (line.startswith("I'll create") or 
+                 line.startswith("This animation") or
+                 line.startswith("<CODE>"))):
+                continue
+                
+            # Stop when we hit explanatory text
+            if line.strip() == "" and len(code_lines) > 0:
+                next_index = i + 1
+                if next_index < len(lines):
+                    next_line = lines[next_index].strip()
+                    if (next_line.startswith("This ") or 
+                        next_line.startswith("The ") or 
+                        next_line.startswith("</CODE>") or
+                        _NUMLIST_RE.match(next_line)):
+                        in_explanatory_text = True
+                        break
+            
+            if not in_explanatory_text:
+                code_lines.append(line)
+        
+        clean_code = '\n'.join(code_lines).strip()
+    
+    return clean_code
+
+
 def clean_manim_code_file(file_path: str) -> Optional[str]:
     """
     Cleans a Manim code file that may contain explanatory text or non-code elements.
@@ -521,55 +1067,21 @@ def clean_manim_code_file(file_path: str) -> Optional[str]:
     if not os.path.exists(file_path):
         logger.error(f"File not found: {file_path}")
         return None
+    
+    # The cleaned file is a pure function of the source, so reuse it while it is up to date
+    cleaned_file_path = file_path.replace('.py', '_cleaned.py')
+    if (cleaned_file_path != file_path and os.path.exists(cleaned_file_path)
+            and os.path.getmtime(cleaned_file_path) >= os.path.getmtime(file_path)):
+        logger.info(f"Cleaned Manim code file is up to date: {cleaned_file_path}")
+        return cleaned_file_path
         
     try:
         with open(file_path, 'r') as f:
             content = f.read()
             
-        # Check for <CODE> tags
-        code_blocks = re.findall(r'<CODE>\n?(.*?)\n?</CODE>', content, re.DOTALL)
-        if code_blocks:
-            clean_code = code_blocks[0].strip()
-        # Check for markdown-style code blocks
-        elif "```python" in content and "```" in content:
-            code_parts = content.split("```python")
-            if len(code_parts) > 1:
-                clean_code = code_parts[1].split("```")[0].strip()
-            else:
-                clean_code = content  # Fallback
-        else:
-            # Try to find where explanatory text starts
-            lines = content.split('\n')
-            code_lines = []
-            in_explanatory_text = False
-            
-            for line in lines:
-                # Skip initial comments that look like explanations
-                if (not code_lines and 
-                    (line.startswith("I'll create") or 
-                     line.startswith("This animation") or
-                     line.startswith("<CODE>"))):
-                    continue
-                    
-                # Stop when we hit explanatory text
-                if line.strip() == "" and len(code_lines) > 0:
-                    next_index = lines.index(line) + 1 if line in lines and lines.index(line) < len(lines) - 1 else -1
-                    if next_index > 0 and next_index < len(lines):
-                        next_line = lines[next_index].strip()
-                        if (next_line.startswith("This ") or 
-                            next_line.startswith("The ") or 
-                            next_line.startswith("</CODE>") or
-                            re.match(r'^\d+\.', next_line)):
-                            in_explanatory_text = True
-                            break
-                
-                if not in_explanatory_text:
-                    code_lines.append(line)
-            
-            clean_code = '\n'.join(code_lines).strip()
+        clean_code = _clean_code_text(content)
         
         # Write the cleaned code to a new file
-        cleaned_file_path = file_path.replace('.py', '_cleaned.py')
         with open(cleaned_file_path, 'w') as f:
             f.write(clean_code)
             
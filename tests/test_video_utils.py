@@ -0,0 +1,50 @@
+"""
+Tests for cleaning generated Manim code in video_utils.
+"""
+
+import unittest
+
+from src.utils.video_utils import _clean_code_text, _largest_parseable_prefix
+
+
+SCENE_CODE = """from manim import *
+
+class MathAnimation(Scene):
+    def construct(self):
+        circle = Circle()
+        square = Square()
+        self.play(
+            Create(circle),
+            run_time=2,
+        )
+        self.play(
+            Transform(circle, square),
+            run_time=2,
+        )
+        self.play(
+            FadeOut(circle),
+        )
+        self.wait(1)"""
+
+PROSE = """
+This animation draws a circle and morphs it into a square.
+The final fade out clears the frame."""
+
+
+class CleanCodeTextTests(unittest.TestCase):
+    def test_prefix_keeps_multiline_calls(self):
+        lines = (SCENE_CODE + PROSE).split("\n")
+        self.assertEqual(_largest_parseable_prefix(lines), SCENE_CODE)
+
+    def test_prefix_without_class_is_none(self):
+        self.assertIsNone(_largest_parseable_prefix(["Just some prose.", "More prose."]))
+
+    def test_trailing_prose_is_stripped(self):
+        self.assertEqual(_clean_code_text(SCENE_CODE + PROSE), SCENE_CODE)
+
+    def test_valid_code_is_unchanged(self):
+        self.assertEqual(_clean_code_text(SCENE_CODE), SCENE_CODE)
+
+
+if __name__ == "__main__":
+    unittest.main()